@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import time
+from itertools import repeat
 
 import pyagentx3
 from pyagentx3.pdu import PDU
@@ -8,36 +9,41 @@ ITERATIONS = 10000
 
 
 def bench_oid_encode():
-    pdu = PDU()
+    encode_oid = PDU().encode_oid
     oid = "1.3.6.1.4.1.27108.3.1.1.1.1.2.42"
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        pdu.encode_oid(oid)
+    for _ in repeat(None, ITERATIONS):
+        encode_oid(oid)
     return time.perf_counter() - start
 
 
 def bench_value_encode():
-    pdu = PDU()
+    encode_value = PDU().encode_value
     oid = "1.3.6.1.4.1.27108.3.1.1.1.1.2.42"
+    t_int = pyagentx3.TYPE_INTEGER
+    t_str = pyagentx3.TYPE_OCTETSTRING
+    t_c64 = pyagentx3.TYPE_COUNTER64
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        pdu.encode_value(pyagentx3.TYPE_INTEGER, oid, 12345)
-        pdu.encode_value(pyagentx3.TYPE_OCTETSTRING, oid, "test string value")
-        pdu.encode_value(pyagentx3.TYPE_COUNTER64, oid, 9999999999)
+    for _ in repeat(None, ITERATIONS):
+        encode_value(t_int, oid, 12345)
+        encode_value(t_str, oid, "test string value")
+        encode_value(t_c64, oid, 9999999999)
     return time.perf_counter() - start
 
 
 def bench_pdu_encode():
+    response = pyagentx3.AGENTX_RESPONSE_PDU
+    values = [
+        {"type": pyagentx3.TYPE_INTEGER, "name": "1.3.6.1.2.1.1.1.0", "value": 42},
+        {"type": pyagentx3.TYPE_OCTETSTRING, "name": "1.3.6.1.2.1.1.2.0", "value": "test"},
+    ]
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        pdu = PDU(pyagentx3.AGENTX_RESPONSE_PDU)
+    for _ in repeat(None, ITERATIONS):
+        pdu = PDU(response)
         pdu.session_id = 1
         pdu.transaction_id = 100
         pdu.packet_id = 50
-        pdu.values = [
-            {"type": pyagentx3.TYPE_INTEGER, "name": "1.3.6.1.2.1.1.1.0", "value": 42},
-            {"type": pyagentx3.TYPE_OCTETSTRING, "name": "1.3.6.1.2.1.1.2.0", "value": "test"},
-        ]
+        pdu.values = values
         pdu.encode()
     return time.perf_counter() - start
 
@@ -50,9 +56,10 @@ def bench_header_decode():
     pdu.values = []
     encoded = pdu.encode()
 
+    decode = PDU.decode_header
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        PDU.decode_header(encoded)
+    for _ in repeat(None, ITERATIONS):
+        decode(encoded)
     return time.perf_counter() - start
 
 
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import time
+from itertools import repeat
 
 from snmpkit.core import (
     Oid,
@@ -7,6 +8,8 @@ from snmpkit.core import (
     VarBind,
     decode_header,
     encode_response_pdu,
+    encode_response_pdu_prepared,
+    encode_varbinds,
 )
 
 ITERATIONS = 10000
@@ -14,18 +17,22 @@ ITERATIONS = 10000
 
 def bench_oid_parse():
     oid_str = "1.3.6.1.4.1.27108.3.1.1.1.1.2.42"
+    new_oid = Oid
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        Oid(oid_str)
+    for _ in repeat(None, ITERATIONS):
+        new_oid(oid_str)
     return time.perf_counter() - start
 
 
 def bench_value_create():
+    integer = Value.Integer
+    octet_string = Value.OctetString
+    counter64 = Value.Counter64
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        Value.Integer(12345)
-        Value.OctetString(b"test string value")
-        Value.Counter64(9999999999)
+    for _ in repeat(None, ITERATIONS):
+        integer(12345)
+        octet_string(b"test string value")
+        counter64(9999999999)
     return time.perf_counter() - start
 
 
@@ -36,9 +43,10 @@ def bench_pdu_encode():
     val2 = Value.OctetString(b"test")
     varbinds = [VarBind(oid1, val1), VarBind(oid2, val2)]
 
+    encode = encode_response_pdu
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        encode_response_pdu(
+    for _ in repeat(None, ITERATIONS):
+        encode(
             session_id=1,
             transaction_id=100,
             packet_id=50,
@@ -50,6 +58,26 @@ def bench_pdu_encode():
     return time.perf_counter() - start
 
 
+def bench_pdu_encode_prepared():
+    oid1 = Oid("1.3.6.1.2.1.1.1.0")
+    oid2 = Oid("1.3.6.1.2.1.1.2.0")
+    val1 = Value.Integer(42)
+    val2 = Value.OctetString(b"test")
+    payload = encode_varbinds([VarBind(oid1, val1), VarBind(oid2, val2)])
+
+    encode = encode_response_pdu_prepared
+    start = time.perf_counter()
+    for _ in repeat(None, ITERATIONS):
+        encode(
+            session_id=1,
+            transaction_id=100,
+            packet_id=50,
+            sys_uptime=0,
+            payload=payload,
+        )
+    return time.perf_counter() - start
+
+
 def bench_header_decode():
     oid1 = Oid("1.3.6.1.2.1.1.1.0")
     val1 = Value.Integer(42)
@@ -63,9 +91,10 @@ def bench_header_decode():
         varbinds=[VarBind(oid1, val1)],
     )
 
+    decode = decode_header
     start = time.perf_counter()
-    for _ in range(ITERATIONS):
-        decode_header(encoded)
+    for _ in repeat(None, ITERATIONS):
+        decode(encoded)
     return time.perf_counter() - start
 
 
@@ -74,6 +103,7 @@ def run_all():
     results["oid_parse"] = bench_oid_parse()
     results["value_create"] = bench_value_create()
     results["pdu_encode"] = bench_pdu_encode()
+    results["pdu_encode_prepared"] = bench_pdu_encode_prepared()
     results["header_decode"] = bench_header_decode()
     return results
 
@@ -19,7 +19,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger("snmpkit.agent")
 
 
-@dataclass
+@dataclass(slots=True)
 class Registration:
     """Internal registration record."""
 
@@ -254,25 +254,11 @@ class Agent:
                     header.session_id,
                 )
 
-                if header.pdu_type == PduTypes.GET:
-                    await self._handler.handle_get(header, payload)
-                elif header.pdu_type == PduTypes.GET_NEXT:
-                    await self._handler.handle_getnext(header, payload)
-                elif header.pdu_type == PduTypes.GET_BULK:
-                    await self._handler.handle_getbulk(header, payload)
-                elif header.pdu_type == PduTypes.TEST_SET:
-                    await self._handler.handle_testset(header, payload)
-                elif header.pdu_type == PduTypes.COMMIT_SET:
-                    await self._handler.handle_commitset(header)
-                elif header.pdu_type == PduTypes.UNDO_SET:
-                    await self._handler.handle_undoset(header)
-                elif header.pdu_type == PduTypes.CLEANUP_SET:
-                    await self._handler.handle_cleanupset(header)
-                elif header.pdu_type == PduTypes.CLOSE:
+                if header.pdu_type == PduTypes.CLOSE:
                     logger.info("Received Close PDU from master")
                     self._running = False
                     break
-                else:
+                if not await self._handler.dispatch(header, payload):
                     logger.warning("Unhandled PDU type: %d", header.pdu_type)
 
             except asyncio.CancelledError:
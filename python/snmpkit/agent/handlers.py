@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_right
 from typing import TYPE_CHECKING
 
 from snmpkit.core import (
     Oid,
+    PduTypes,
     Value,
     VarBind,
     decode_get_pdu,
@@ -28,69 +30,84 @@ class DataStore:
     def __init__(self) -> None:
         self._data: dict[str, dict[str, VarBind]] = {}
         self._data_idx: dict[str, list[str]] = {}
+        self._data_keys: dict[str, list[tuple[int, ...]]] = {}
+        self._owned: dict[tuple[str, str], set[str]] = {}
+        self._cursor: dict[str, int] = {}
+        self._key_tuples: dict[str, dict[str, tuple[int, ...]]] = {}
 
     def update(self, oid: str, context: str | None, varbinds: list[VarBind]) -> None:
         """Update stored data for an OID subtree."""
         ctx_key = context or ""
         if ctx_key not in self._data:
-            self._data[ctx_key] = {}
-            self._data_idx[ctx_key] = []
-
-        prefix = oid + "."
-        to_delete = [k for k in self._data[ctx_key] if k.startswith(prefix) or k == oid]
-        for k in to_delete:
-            del self._data[ctx_key][k]
-
-        for vb in varbinds:
-            full_oid = str(vb.oid)
-            self._data[ctx_key][full_oid] = vb
-
-        self._data_idx[ctx_key] = sorted(
-            self._data[ctx_key].keys(),
-            key=lambda k: tuple(int(p) for p in k.split(".")),
-        )
+            self.init_context(ctx_key)
+        ctx_data = self._data[ctx_key]
+        ctx_tuples = self._key_tuples[ctx_key]
+
+        # Only the keys written by the previous update of this subtree need
+        # removing, so there is no scan over the whole context.
+        new_data = {str(vb.oid): vb for vb in varbinds}
+        owned = self._owned.get((ctx_key, oid), set())
+        stale = owned - new_data.keys()
+        if stale:
+            # Nested or overlapping registrations can publish the same OID;
+            # it stays while any other subtree in the context still owns it.
+            for (owner_ctx, owner_oid), keys in self._owned.items():
+                if owner_ctx == ctx_key and owner_oid != oid:
+                    stale -= keys
+        for k in stale:
+            ctx_data.pop(k, None)
+            ctx_tuples.pop(k, None)
+        ctx_data.update(new_data)
+
+        # Each key is converted once while it is live; later reindexes reuse
+        # it. The Oid already holds parsed sub-identifiers, so take those
+        # rather than splitting the string form again.
+        for k in new_data.keys() - ctx_tuples.keys():
+            ctx_tuples[k] = tuple(new_data[k].oid.parts)
+        self._owned[(ctx_key, oid)] = set(new_data)
+
+        # Republishing the same OIDs leaves the ordering untouched.
+        if stale or not new_data.keys() <= owned:
+            self._reindex(ctx_key)
+
+    def _reindex(self, ctx_key: str) -> None:
+        """Rebuild the sorted key index for a context."""
+        # Keep the numeric keys parallel to the string index so get_next can
+        # bisect on native tuple comparison instead of re-parsing strings.
+        ctx_tuples = self._key_tuples[ctx_key]
+        ctx_idx = sorted(ctx_tuples, key=ctx_tuples.__getitem__)
+        self._data_keys[ctx_key] = [ctx_tuples[k] for k in ctx_idx]
+        self._data_idx[ctx_key] = ctx_idx
 
     def get(self, oid: str, context: str | None) -> VarBind | None:
         """Get exact value for an OID."""
-        ctx_key = context or ""
-        return self._data.get(ctx_key, {}).get(oid)
+        ctx_data = self._data.get(context or "")
+        return ctx_data.get(oid) if ctx_data is not None else None
 
     def get_next(self, oid: str, end_oid: str, context: str | None) -> str | None:
         """Get next OID in lexicographic order."""
         ctx_key = context or ""
-        ctx_data = self._data.get(ctx_key, {})
-        ctx_idx = self._data_idx.get(ctx_key, [])
-
-        if not ctx_idx:
-            return None
+        ctx_keys = self._data_keys.get(ctx_key)
 
-        if oid in ctx_data:
-            idx = ctx_idx.index(oid)
-            if idx < len(ctx_idx) - 1:
-                next_oid = ctx_idx[idx + 1]
-                if self._oid_le(next_oid, end_oid):
-                    return next_oid
+        if not ctx_keys:
             return None
 
-        oid_tuple = tuple(int(p) for p in oid.split("."))
-        end_tuple = tuple(int(p) for p in end_oid.split(".")) if end_oid else None
-
-        for candidate in ctx_idx:
-            candidate_tuple = tuple(int(p) for p in candidate.split("."))
-            if candidate_tuple > oid_tuple:
-                if end_tuple is None or candidate_tuple <= end_tuple:
-                    return candidate
-                break
+        ctx_idx = self._data_idx[ctx_key]
 
-        return None
+        # Walks ask for the successor of the OID returned last time, so try
+        # the position after it before falling back to a binary search.
+        last = self._cursor.get(ctx_key, -1)
+        if 0 <= last < len(ctx_idx) and ctx_idx[last] == oid:
+            pos = last + 1
+        else:
+            pos = bisect_right(ctx_keys, _oid_tuple(oid))
 
-    def _oid_le(self, oid1: str, oid2: str) -> bool:
-        """Check if oid1 <= oid2 lexicographically."""
-        if not oid2:
-            return True
-        t1 = tuple(int(p) for p in oid1.split("."))
-        t2 = tuple(int(p) for p in oid2.split("."))
-        return t1 <= t2
+        if pos == len(ctx_keys):
+            return None
+        if end_oid and ctx_keys[pos] > _oid_tuple(end_oid):
+            return None
+        self._cursor[ctx_key] = pos
+        return ctx_idx[pos]
 
     def init_context(self, context: str | None) -> None:
         """Initialize data store for a context."""
@@ -98,6 +115,25 @@ class DataStore:
         if ctx_key not in self._data:
             self._data[ctx_key] = {}
             self._data_idx[ctx_key] = []
+            self._data_keys[ctx_key] = []
+            self._key_tuples[ctx_key] = {}
+
+
+def _oid_tuple(oid: str) -> tuple[int, ...]:
+    """Convert a dotted OID string to a tuple of sub-identifiers."""
+    return tuple(map(int, oid.split(".")))
+
+
+# PDU type -> (RequestHandler method name, whether it takes the payload)
+_DISPATCH: dict[int, tuple[str, bool]] = {
+    PduTypes.GET: ("handle_get", True),
+    PduTypes.GET_NEXT: ("handle_getnext", True),
+    PduTypes.GET_BULK: ("handle_getbulk", True),
+    PduTypes.TEST_SET: ("handle_testset", True),
+    PduTypes.COMMIT_SET: ("handle_commitset", False),
+    PduTypes.UNDO_SET: ("handle_undoset", False),
+    PduTypes.CLEANUP_SET: ("handle_cleanupset", False),
+}
 
 
 class RequestHandler:
@@ -113,6 +149,20 @@ class RequestHandler:
         self._data = data_store
         self._set_handlers = set_handlers
 
+    async def dispatch(self, header: object, payload: bytes) -> bool:
+        """Route a request PDU to its handler. Returns False for unhandled types."""
+        entry = _DISPATCH.get(header.pdu_type)
+        if entry is None:
+            return False
+        # Look the method up per call so subclass overrides and patches apply
+        name, takes_payload = entry
+        handle = getattr(self, name)
+        if takes_payload:
+            await handle(header, payload)
+        else:
+            await handle(header)
+        return True
+
     async def handle_get(self, header: object, payload: bytes) -> None:
         """Handle GET request."""
         get_pdu = decode_get_pdu(payload, header.payload_length)
@@ -12,15 +12,15 @@ class SetHandler:
     def __init__(self) -> None:
         self._agent: Agent | None = None
         self._base_oid: str = ""
-        self._transactions: dict[str, tuple[str, Any]] = {}
+        self._transactions: dict[tuple[int, int], tuple[str, Any]] = {}
 
     def _bind(self, agent: Agent, base_oid: str) -> None:
         """Called by Agent when registering this handler."""
         self._agent = agent
         self._base_oid = base_oid
 
-    def _make_tid(self, session_id: int, transaction_id: int) -> str:
-        return f"{session_id}_{transaction_id}"
+    def _make_tid(self, session_id: int, transaction_id: int) -> tuple[int, int]:
+        return (session_id, transaction_id)
 
     async def _network_test(
         self, session_id: int, transaction_id: int, oid: str, value: Any
@@ -34,26 +34,27 @@ class SetHandler:
     async def _network_commit(self, session_id: int, transaction_id: int) -> None:
         """Called by network layer for CommitSet PDU."""
         tid = self._make_tid(session_id, transaction_id)
-        if tid not in self._transactions:
+        txn = self._transactions.get(tid)
+        if txn is None:
             return
-        oid, value = self._transactions[tid]
+        oid, value = txn
         await self.commit(oid, value)
         self._transactions.pop(tid, None)
 
     async def _network_undo(self, session_id: int, transaction_id: int) -> None:
         """Called by network layer for UndoSet PDU."""
         tid = self._make_tid(session_id, transaction_id)
-        if tid in self._transactions:
-            oid, _ = self._transactions[tid]
-            await self.undo(oid)
+        txn = self._transactions.get(tid)
+        if txn is not None:
+            await self.undo(txn[0])
             self._transactions.pop(tid, None)
 
     async def _network_cleanup(self, session_id: int, transaction_id: int) -> None:
         """Called by network layer for CleanupSet PDU."""
         tid = self._make_tid(session_id, transaction_id)
-        if tid in self._transactions:
-            oid, _ = self._transactions[tid]
-            await self.cleanup(oid)
+        txn = self._transactions.get(tid)
+        if txn is not None:
+            await self.cleanup(txn[0])
             self._transactions.pop(tid, None)
 
     # User overrides these
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from snmpkit.core import Oid, Value, VarBind
@@ -7,6 +9,29 @@ from snmpkit.core import Oid, Value, VarBind
 if TYPE_CHECKING:
     from snmpkit.agent.agent import Agent
 
+# Values are immutable, so identical inputs can share one instance instead of
+# crossing into the extension to build a new object on every update cycle.
+_VALUE_CACHE_SIZE = 4096
+_VALUE_CACHE_MAX_BYTES = 256
+
+
+@lru_cache(maxsize=_VALUE_CACHE_SIZE, typed=True)
+def _integer(value: int) -> Value:
+    return Value.Integer(value)
+
+
+@lru_cache(maxsize=_VALUE_CACHE_SIZE, typed=True)
+def _cached_octet_string(value: bytes) -> Value:
+    return Value.OctetString(value)
+
+
+def _octet_string(value: bytes) -> Value:
+    # Only exact bytes are hashable and immutable; bytearray, memoryview and
+    # other buffers go straight to the extension.
+    if type(value) is not bytes or len(value) > _VALUE_CACHE_MAX_BYTES:
+        return Value.OctetString(value)
+    return _cached_octet_string(value)
+
 
 class Updater:
     """Base class for OID handlers. Override update() to provide values."""
@@ -15,21 +40,36 @@ class Updater:
         self._values: dict[str, Value] = {}
         self._agent: Agent | None = None
         self._base_oid: str = ""
+        self._varbinds: dict[str, tuple[Value, VarBind]] = {}
 
     def _bind(self, agent: Agent, base_oid: str) -> None:
         """Called by Agent when registering this updater."""
         self._agent = agent
         self._base_oid = base_oid
+        self._varbinds = {}
 
     async def update(self) -> None:
         """Override to set values. Called periodically by the agent."""
 
     def get_varbinds(self) -> list[VarBind]:
         """Return all values as VarBinds for responding to requests."""
+        # Poll cycles mostly republish the same values, so keep the VarBind
+        # built last time and only rebuild those whose value object changed.
+        previous = self._varbinds
+        current = {}
         result = []
         for oid_str, value in self._values.items():
-            full_oid = f"{self._base_oid}.{oid_str}" if self._base_oid else oid_str
-            result.append(VarBind(Oid(full_oid), value))
+            cached = previous.get(oid_str)
+            if cached is not None and cached[0] is value:
+                vb = cached[1]
+            elif cached is not None:
+                vb = VarBind(cached[1].oid, value)
+            else:
+                full_oid = f"{self._base_oid}.{oid_str}" if self._base_oid else oid_str
+                vb = VarBind(Oid(full_oid), value)
+            current[oid_str] = (value, vb)
+            result.append(vb)
+        self._varbinds = current
         return result
 
     def get_value(self, oid: str) -> Value | None:
@@ -43,12 +83,16 @@ class Updater:
     # Value setters
 
     def set_INTEGER(self, oid: str, value: int) -> None:
-        self._values[oid] = Value.Integer(value)
+        self._values[oid] = _integer(value)
+
+    def set_many_INTEGER(self, pairs: Iterable[tuple[str, int]]) -> None:
+        """Set several Integer values from (oid, value) pairs in one call."""
+        self._values.update((oid, _integer(value)) for oid, value in pairs)
 
     def set_OCTETSTRING(self, oid: str, value: str | bytes) -> None:
         if isinstance(value, str):
             value = value.encode("utf-8")
-        self._values[oid] = Value.OctetString(value)
+        self._values[oid] = _octet_string(value)
 
     def set_OBJECTIDENTIFIER(self, oid: str, value: str) -> None:
         self._values[oid] = Value.ObjectIdentifier(Oid(value))
@@ -169,6 +169,14 @@ def encode_response_pdu(
     index: int,
     varbinds: list[VarBind],
 ) -> bytes: ...
+def encode_response_pdu_prepared(
+    session_id: int,
+    transaction_id: int,
+    packet_id: int,
+    sys_uptime: int,
+    payload: bytes,
+) -> bytes: ...
+def encode_varbinds(varbinds: list[VarBind]) -> bytes: ...
 def encode_notify_pdu(
     session_id: int,
     transaction_id: int,
@@ -18,8 +18,7 @@ class MockUpdater(Updater):
         self._mock_values = values or {}
 
     async def update(self):
-        for oid, val in self._mock_values.items():
-            self.set_INTEGER(oid, val)
+        self.set_many_INTEGER(self._mock_values.items())
 
 
 @pytest.fixture
@@ -1,7 +1,7 @@
 """Unit Tests for the DataStore class."""
 
 import pytest
-from snmpkit.agent.handlers import DataStore
+from snmpkit.agent.handlers import DataStore, _oid_tuple
 from snmpkit.core import Oid, Value, VarBind
 
 
@@ -74,6 +74,49 @@ class TestDataStoreUpdate:
         # New value should exist
         assert store.get("1.3.6.1.2.1.1.2.0", None) is not None
 
+    def test_update_keeps_other_subtrees(self, store):
+        """Replacing one subtree leaves data from other subtrees alone."""
+        store.update("1.3.6.1.2.1.1", None, [vb("1.3.6.1.2.1.1.1.0", 1)])
+        store.update("1.3.6.1.2.1.2", None, [vb("1.3.6.1.2.1.2.1.0", 2)])
+
+        store.update("1.3.6.1.2.1.1", None, [])
+
+        assert store.get("1.3.6.1.2.1.1.1.0", None) is None
+        assert store.get("1.3.6.1.2.1.2.1.0", None) is not None
+        assert store.get_next("1.3.6.1", "", None) == "1.3.6.1.2.1.2.1.0"
+
+    def test_update_nested_registration_keeps_shared_key(self, store):
+        """A parent update does not drop an OID a nested subtree still owns."""
+        store.update("1.3.6.1", None, [vb("1.3.6.1.1.0", 1), vb("1.3.6.1.4.1.0", 1)])
+        store.update("1.3.6.1.4", None, [vb("1.3.6.1.4.1.0", 2)])
+
+        store.update("1.3.6.1", None, [vb("1.3.6.1.1.0", 3)])
+
+        assert store.get("1.3.6.1.4.1.0", None).value == Value.Integer(2)
+        assert store.get_next("1.3.6.1.1.0", "", None) == "1.3.6.1.4.1.0"
+
+        # Once the nested subtree drops it too, the OID is gone.
+        store.update("1.3.6.1.4", None, [])
+        assert store.get("1.3.6.1.4.1.0", None) is None
+        assert store.get_next("1.3.6.1.1.0", "", None) is None
+
+    def test_update_same_oids_new_values(self, store):
+        """Republishing the same OIDs refreshes values and keeps ordering."""
+        oids = ["1.3.6.1.1.0", "1.3.6.1.2.0"]
+        store.update("1.3.6.1", None, [vb(o, 1) for o in oids])
+        store.update("1.3.6.1", None, [vb(o, 2) for o in oids])
+
+        assert store.get("1.3.6.1.2.0", None).value == Value.Integer(2)
+        assert store.get_next("1.3.6.1.1.0", "", None) == "1.3.6.1.2.0"
+
+    def test_update_drops_parsed_keys_with_data(self, store):
+        """Parsed keys are kept only for OIDs that are still stored."""
+        store.update("1.3.6.1", None, [vb("1.3.6.1.1.0"), vb("1.3.6.1.2.0")])
+        store.update("1.3.6.1", None, [vb("1.3.6.1.2.0"), vb("1.3.6.1.3.0")])
+
+        assert store._key_tuples[""].keys() == store._data[""].keys()
+        assert store._key_tuples[""]["1.3.6.1.3.0"] == (1, 3, 6, 1, 3, 0)
+
     def test_update_with_context(self, store):
         """Update stores in specified context."""
         store.update("1.3.6.1", "ctx1", [vb("1.3.6.1.1.0", 1)])
@@ -214,6 +257,11 @@ class TestDataStoreGetNext:
         # In ctx2, after 1.0 is 3.0
         assert store.get_next("1.3.6.1.1.0", "", "ctx2") == "1.3.6.1.3.0"
 
+    def test_get_next_empty_end(self, store):
+        """Empty end OID means no upper bound."""
+        store.update("1.3.6.1", None, [vb("1.3.6.1.9999")])
+        assert store.get_next("1.3.6.1", "", None) == "1.3.6.1.9999"
+
 
 class TestDataStoreLexicographicOrdering:
     """Tests for correct SNMP lexicographic OID ordering."""
@@ -285,22 +333,50 @@ class TestDataStoreLexicographicOrdering:
             assert oid == exp
             oid = store.get_next(oid, "", None)
 
+    def test_walk_survives_reindex(self, store):
+        """A walk in progress stays correct when an update shifts the index."""
+        oids = ["1.3.6.1.1.0", "1.3.6.1.2.0", "1.3.6.1.3.0"]
+        store.update("1.3.6.1", None, [vb(o) for o in oids])
+        assert store.get_next("1.3.6.1.1.0", "", None) == "1.3.6.1.2.0"
 
-class TestDataStoreOidLe:
-    """Tests for _oid_le helper method."""
+        store.update("1.3.6.1", None, [vb(o) for o in ["1.3.6.1.1.5", *oids]])
 
-    def test_oid_le_equal(self, store):
-        """Equal OIDs are <=."""
-        assert store._oid_le("1.3.6.1", "1.3.6.1") is True
+        assert store.get_next("1.3.6.1.2.0", "", None) == "1.3.6.1.3.0"
+        assert store.get_next("1.3.6.1.1.0", "", None) == "1.3.6.1.1.5"
 
-    def test_oid_le_less(self, store):
-        """Smaller OID is <=."""
-        assert store._oid_le("1.3.6.1", "1.3.6.2") is True
+    def test_full_walk_large_table(self, store):
+        """Walking from the root visits every OID exactly once, in numeric order."""
+        oids = [f"1.3.6.1.1.{col}.{row}" for col in (1, 2, 10) for row in range(1, 120)]
+        store.update("1.3.6.1", None, [vb(o) for o in reversed(oids)])
 
-    def test_oid_le_greater(self, store):
-        """Greater OID is not <=."""
-        assert store._oid_le("1.3.6.2", "1.3.6.1") is False
+        walked = []
+        oid = store.get_next("1.3.6.1", "", None)
+        while oid is not None:
+            walked.append(oid)
+            oid = store.get_next(oid, "", None)
 
-    def test_oid_le_empty_end(self, store):
-        """Empty end OID means no upper bound."""
-        assert store._oid_le("1.3.6.1.9999", "") is True
+        assert walked == oids
+
+
+class TestOidTuple:
+    """Tests for the _oid_tuple key that get_next bisects on."""
+
+    def test_oid_tuple_equal(self):
+        """Equal OIDs give equal keys."""
+        assert _oid_tuple("1.3.6.1") == _oid_tuple("1.3.6.1")
+
+    def test_oid_tuple_less(self):
+        """Smaller OID sorts first."""
+        assert _oid_tuple("1.3.6.1") < _oid_tuple("1.3.6.2")
+
+    def test_oid_tuple_greater(self):
+        """Greater OID sorts after."""
+        assert _oid_tuple("1.3.6.2") > _oid_tuple("1.3.6.1")
+
+    def test_oid_tuple_numeric_order(self):
+        """Sub-identifiers compare numerically, not as strings."""
+        assert _oid_tuple("1.3.6.1.9") < _oid_tuple("1.3.6.1.10")
+
+    def test_oid_tuple_prefix_first(self):
+        """A prefix sorts before the OIDs beneath it."""
+        assert _oid_tuple("1.3.6.1") < _oid_tuple("1.3.6.1.0")
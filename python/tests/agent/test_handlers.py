@@ -1,16 +1,31 @@
 """Unit Tests for the RequestHandler class."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from contextvars import ContextVar
+from functools import lru_cache
+from unittest.mock import MagicMock
 
 import pytest
 from snmpkit.agent.handlers import NOT_WRITABLE, WRONG_VALUE, DataStore, RequestHandler
 from snmpkit.agent.set_handler import SetHandler
-from snmpkit.core import Oid, Value, VarBind
+from snmpkit.core import Oid, PduTypes, Value, VarBind
 
 
-def vb(oid_str: str, value: int = 0) -> VarBind:
+@lru_cache(maxsize=None)
+def _oid(oid_str: str) -> Oid:
+    """Parse an OID literal once; Oid is immutable, so instances can be shared."""
+    return Oid(oid_str)
+
+
+# Integer values shared by the small ints most tests use
+_INT_CACHE = {i: Value.Integer(i) for i in range(-1, 16)}
+
+
+def vb(oid_str: str, value: int = 0, /) -> VarBind:
     """Helper to create VarBind with Integer value."""
-    return VarBind(Oid(oid_str), Value.Integer(value))
+    v = _INT_CACHE.get(value)
+    if v is None:
+        v = Value.Integer(value)
+    return VarBind(_oid(oid_str), v)
 
 
 class MockHeader:
@@ -22,19 +37,55 @@ class MockHeader:
         self.payload_length = payload_length
 
 
+class _FakeProtocol:
+    """Records send_response calls in place of a connected Protocol."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def send_response(self, header, varbinds, **kwargs):
+        self.calls.append((header, varbinds, kwargs))
+
+
+def _last_varbinds(protocol: _FakeProtocol) -> list:
+    """Varbinds of the most recent response."""
+    return protocol.calls[-1][1]
+
+
+def _last_kwargs(protocol: _FakeProtocol) -> dict:
+    """Keyword arguments (error, index) of the most recent response."""
+    return protocol.calls[-1][2]
+
+
+class _Counter:
+    """Async callable that counts awaits and raises side_effect when set."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.side_effect = None
+
+    async def __call__(self, *args, **kwargs):
+        self.n += 1
+        if self.side_effect is not None:
+            raise self.side_effect
+
+
 class MockGetPdu:
     """Mock GET/GETNEXT PDU."""
 
     def __init__(self, ranges):
-        # ranges: list of (start_oid, end_oid, include)
-        self.ranges = [(Oid(s), Oid(e) if e else None, i) for s, e, i in ranges]
+        # ranges: (start_oid, end_oid, include) tuples of pre-built Oids
+        self.ranges = tuple(ranges)
 
 
 class MockBulkPdu:
     """Mock GETBULK PDU."""
 
     def __init__(self, ranges, non_repeaters=0, max_repetitions=10):
-        self.ranges = [(Oid(s), Oid(e) if e else None, i) for s, e, i in ranges]
+        self.ranges = tuple(ranges)
         self.non_repeaters = non_repeaters
         self.max_repetitions = max_repetitions
 
@@ -46,34 +97,79 @@ class MockTestSetPdu:
         self.varbinds = varbinds
 
 
-@pytest.fixture
-def data_store():
-    """Create a DataStore with test data."""
+# PDU the patched decoders hand back to the handler under test
+_CURRENT_PDU: ContextVar[object] = ContextVar("_CURRENT_PDU", default=None)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fake_decoders():
+    """Route the handler's PDU decoders to the PDU set by the current test."""
+    with pytest.MonkeyPatch.context() as mp:
+        for name in ("decode_get_pdu", "decode_getbulk_pdu", "decode_testset_pdu"):
+            mp.setattr(f"snmpkit.agent.handlers.{name}", lambda *_: _CURRENT_PDU.get())
+        yield
+
+
+def _range(start: str, end: str | None = None) -> tuple[Oid, Oid | None, bool]:
+    return (_oid(start), _oid(end) if end else None, False)
+
+
+# === Test corpus constants ===
+# Built once at import so fixtures and tests only reference them.
+
+_RANGE_1 = _range("1.3.6.1.2.1.1.1.0")
+_RANGE_3 = _range("1.3.6.1.2.1.1.3.0")
+_RANGE_MISSING = _range("1.3.6.1.2.1.1.99.0")
+_RANGE_BEFORE_FIRST = _range("1.3.6.1.2.1.1.0")
+_RANGE_1_TO_2 = _range("1.3.6.1.2.1.1.1.0", "1.3.6.1.2.1.1.2.0")
+
+_VB1 = vb("1.3.6.1.2.1.1.1.0", 1)
+_VB2 = vb("1.3.6.1.2.1.1.2.0", 2)
+_VB3 = vb("1.3.6.1.2.1.1.3.0", 3)
+
+_STORE_PREFIX = "1.3.6.1.2.1.1"
+_STORE_VBS = (_VB1, _VB2, _VB3)
+
+# Distinct sentinels standing in for registered SetHandlers
+_H1 = object()
+_H2 = object()
+
+
+def _make_store() -> DataStore:
     store = DataStore()
-    store.update(
-        "1.3.6.1.2.1.1",
-        None,
-        [
-            vb("1.3.6.1.2.1.1.1.0", 1),
-            vb("1.3.6.1.2.1.1.2.0", 2),
-            vb("1.3.6.1.2.1.1.3.0", 3),
-        ],
-    )
+    store.update(_STORE_PREFIX, None, _STORE_VBS)
     return store
 
 
+@pytest.fixture(scope="module")
+def data_store():
+    """DataStore with test data, shared by tests that only read it."""
+    return _make_store()
+
+
+@pytest.fixture
+def mutable_data_store():
+    """Fresh DataStore with test data for tests that may modify it."""
+    return _make_store()
+
+
 @pytest.fixture
 def protocol():
-    """Create a mock protocol."""
-    p = MagicMock()
-    p.send_response = AsyncMock()
-    return p
+    """Create a fake protocol that records responses."""
+    return _FakeProtocol()
+
+
+@pytest.fixture(scope="class")
+def class_request_handler(data_store):
+    """RequestHandler with empty set handlers, built once per test class."""
+    return RequestHandler(_FakeProtocol(), data_store, {})
 
 
 @pytest.fixture
-def handler(protocol, data_store):
-    """Create a RequestHandler with empty set handlers."""
-    return RequestHandler(protocol, data_store, {})
+def handler(class_request_handler, protocol):
+    """The class's RequestHandler, wired to this test's fresh protocol."""
+    class_request_handler._protocol = protocol
+    return class_request_handler
 
 
 class TestRequestHandlerGet:
@@ -81,43 +177,42 @@ class TestRequestHandlerGet:
 
     async def test_get_single_oid(self, handler, protocol):
         """GET single existing OID."""
-        with patch("snmpkit.agent.handlers.decode_get_pdu") as mock_decode:
-            mock_decode.return_value = MockGetPdu([("1.3.6.1.2.1.1.1.0", "", False)])
+        _CURRENT_PDU.set(MockGetPdu([_RANGE_1]))
 
-            await handler.handle_get(MockHeader(), b"")
+        await handler.handle_get(MockHeader(), b"")
 
-            protocol.send_response.assert_called_once()
-            header, varbinds = protocol.send_response.call_args.args
-            assert len(varbinds) == 1
-            assert varbinds[0].value == Value.Integer(1)
+        assert len(protocol.calls) == 1
+        header, varbinds, _ = protocol.calls[-1]
+        assert len(varbinds) == 1
+        assert varbinds[0].value == Value.Integer(1)
 
     async def test_get_multiple_oids(self, handler, protocol):
         """GET multiple existing OIDs."""
-        with patch("snmpkit.agent.handlers.decode_get_pdu") as mock_decode:
-            mock_decode.return_value = MockGetPdu(
+        _CURRENT_PDU.set(
+            MockGetPdu(
                 [
-                    ("1.3.6.1.2.1.1.1.0", "", False),
-                    ("1.3.6.1.2.1.1.3.0", "", False),
+                    _RANGE_1,
+                    _RANGE_3,
                 ]
             )
+        )
 
-            await handler.handle_get(MockHeader(), b"")
+        await handler.handle_get(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert len(varbinds) == 2
-            assert varbinds[0].value == Value.Integer(1)
-            assert varbinds[1].value == Value.Integer(3)
+        varbinds = _last_varbinds(protocol)
+        assert len(varbinds) == 2
+        assert varbinds[0].value == Value.Integer(1)
+        assert varbinds[1].value == Value.Integer(3)
 
     async def test_get_missing_oid(self, handler, protocol):
         """GET non-existent OID returns NoSuchObject."""
-        with patch("snmpkit.agent.handlers.decode_get_pdu") as mock_decode:
-            mock_decode.return_value = MockGetPdu([("1.3.6.1.2.1.1.99.0", "", False)])
+        _CURRENT_PDU.set(MockGetPdu([_RANGE_MISSING]))
 
-            await handler.handle_get(MockHeader(), b"")
+        await handler.handle_get(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert len(varbinds) == 1
-            assert varbinds[0].value == Value.NoSuchObject()
+        varbinds = _last_varbinds(protocol)
+        assert len(varbinds) == 1
+        assert varbinds[0].value == Value.NoSuchObject()
 
 
 class TestRequestHandlerGetNext:
@@ -125,48 +220,42 @@ class TestRequestHandlerGetNext:
 
     async def test_getnext_basic(self, handler, protocol):
         """GETNEXT returns next OID in sequence."""
-        with patch("snmpkit.agent.handlers.decode_get_pdu") as mock_decode:
-            mock_decode.return_value = MockGetPdu([("1.3.6.1.2.1.1.1.0", "", False)])
+        _CURRENT_PDU.set(MockGetPdu([_RANGE_1]))
 
-            await handler.handle_getnext(MockHeader(), b"")
+        await handler.handle_getnext(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert len(varbinds) == 1
-            assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.2.0"
-            assert varbinds[0].value == Value.Integer(2)
+        varbinds = _last_varbinds(protocol)
+        assert len(varbinds) == 1
+        assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.2.0"
+        assert varbinds[0].value == Value.Integer(2)
 
     async def test_getnext_past_last(self, handler, protocol):
         """GETNEXT past last OID returns EndOfMibView."""
-        with patch("snmpkit.agent.handlers.decode_get_pdu") as mock_decode:
-            mock_decode.return_value = MockGetPdu([("1.3.6.1.2.1.1.3.0", "", False)])
+        _CURRENT_PDU.set(MockGetPdu([_RANGE_3]))
 
-            await handler.handle_getnext(MockHeader(), b"")
+        await handler.handle_getnext(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert varbinds[0].value == Value.EndOfMibView()
+        varbinds = _last_varbinds(protocol)
+        assert varbinds[0].value == Value.EndOfMibView()
 
     async def test_getnext_from_prefix(self, handler, protocol):
         """GETNEXT from prefix OID returns first child."""
-        with patch("snmpkit.agent.handlers.decode_get_pdu") as mock_decode:
-            mock_decode.return_value = MockGetPdu([("1.3.6.1.2.1.1.0", "", False)])
+        _CURRENT_PDU.set(MockGetPdu([_RANGE_BEFORE_FIRST]))
 
-            await handler.handle_getnext(MockHeader(), b"")
+        await handler.handle_getnext(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.1.0"
+        varbinds = _last_varbinds(protocol)
+        assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.1.0"
 
     async def test_getnext_with_end_oid(self, handler, protocol):
         """GETNEXT respects end_oid boundary."""
-        with patch("snmpkit.agent.handlers.decode_get_pdu") as mock_decode:
-            # End at 1.3.6.1.2.1.1.2.0
-            mock_decode.return_value = MockGetPdu(
-                [("1.3.6.1.2.1.1.1.0", "1.3.6.1.2.1.1.2.0", False)]
-            )
+        # End at 1.3.6.1.2.1.1.2.0
+        _CURRENT_PDU.set(MockGetPdu([_RANGE_1_TO_2]))
 
-            await handler.handle_getnext(MockHeader(), b"")
+        await handler.handle_getnext(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.2.0"
+        varbinds = _last_varbinds(protocol)
+        assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.2.0"
 
 
 class TestRequestHandlerGetBulk:
@@ -174,178 +263,225 @@ class TestRequestHandlerGetBulk:
 
     async def test_getbulk_non_repeaters(self, handler, protocol):
         """GETBULK handles non-repeaters like GETNEXT."""
-        with patch("snmpkit.agent.handlers.decode_getbulk_pdu") as mock_decode:
-            mock_decode.return_value = MockBulkPdu(
-                [("1.3.6.1.2.1.1.1.0", "", False)],
+        _CURRENT_PDU.set(
+            MockBulkPdu(
+                [_RANGE_1],
                 non_repeaters=1,
                 max_repetitions=10,
             )
+        )
 
-            await handler.handle_getbulk(MockHeader(), b"")
+        await handler.handle_getbulk(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert len(varbinds) == 1
-            assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.2.0"
+        varbinds = _last_varbinds(protocol)
+        assert len(varbinds) == 1
+        assert str(varbinds[0].oid) == "1.3.6.1.2.1.1.2.0"
 
     async def test_getbulk_repeaters(self, handler, protocol):
         """GETBULK repeaters return multiple values."""
-        with patch("snmpkit.agent.handlers.decode_getbulk_pdu") as mock_decode:
-            mock_decode.return_value = MockBulkPdu(
-                [("1.3.6.1.2.1.1.0", "", False)],  # Before first OID
+        _CURRENT_PDU.set(
+            MockBulkPdu(
+                [_RANGE_BEFORE_FIRST],  # Before first OID
                 non_repeaters=0,
                 max_repetitions=10,
             )
+        )
 
-            await handler.handle_getbulk(MockHeader(), b"")
+        await handler.handle_getbulk(MockHeader(), b"")
 
-            varbinds = protocol.send_response.call_args.args[1]
-            # Should get all 3 values plus EndOfMibView
-            assert len(varbinds) == 4
-            assert varbinds[0].value == Value.Integer(1)
-            assert varbinds[1].value == Value.Integer(2)
-            assert varbinds[2].value == Value.Integer(3)
-            assert varbinds[3].value == Value.EndOfMibView()
+        varbinds = _last_varbinds(protocol)
+        # Should get all 3 values plus EndOfMibView
+        assert len(varbinds) == 4
+        assert varbinds[0].value == Value.Integer(1)
+        assert varbinds[1].value == Value.Integer(2)
+        assert varbinds[2].value == Value.Integer(3)
+        assert varbinds[3].value == Value.EndOfMibView()
 
     async def test_getbulk_max_repetitions_limits(self, handler, protocol):
         """GETBULK respects max_repetitions limit."""
-        with patch("snmpkit.agent.handlers.decode_getbulk_pdu") as mock_decode:
-            mock_decode.return_value = MockBulkPdu(
-                [("1.3.6.1.2.1.1.0", "", False)],
+        _CURRENT_PDU.set(
+            MockBulkPdu(
+                [_RANGE_BEFORE_FIRST],
                 non_repeaters=0,
                 max_repetitions=2,
             )
+        )
+
+        await handler.handle_getbulk(MockHeader(), b"")
 
-            await handler.handle_getbulk(MockHeader(), b"")
+        varbinds = _last_varbinds(protocol)
+        assert len(varbinds) == 2
+        assert varbinds[0].value == Value.Integer(1)
+        assert varbinds[1].value == Value.Integer(2)
 
-            varbinds = protocol.send_response.call_args.args[1]
-            assert len(varbinds) == 2
-            assert varbinds[0].value == Value.Integer(1)
-            assert varbinds[1].value == Value.Integer(2)
+
+@pytest.fixture(scope="class")
+def set_handler():
+    """Create a SetHandler with counting network stubs."""
+    h = SetHandler()
+    h._bind(MagicMock(), "1.3.6.1.2.1.1")
+    h._network_test = _Counter()
+    h._network_commit = _Counter()
+    h._network_undo = _Counter()
+    h._network_cleanup = _Counter()
+    return h
 
 
 class TestRequestHandlerSet:
     """Tests for SET request handling (TestSet, CommitSet, UndoSet, CleanupSet)."""
 
-    @pytest.fixture
-    def set_handler(self):
-        """Create a mock SetHandler."""
-        h = SetHandler()
-        h._bind(MagicMock(), "1.3.6.1.2.1.1")
-        h._network_test = AsyncMock()
-        h._network_commit = AsyncMock()
-        h._network_undo = AsyncMock()
-        h._network_cleanup = AsyncMock()
-        return h
+    @pytest.fixture(autouse=True)
+    def _reset_mocks(self, set_handler):
+        """Clear the shared SetHandler's stubs before each test."""
+        for stub in (
+            set_handler._network_test,
+            set_handler._network_commit,
+            set_handler._network_undo,
+            set_handler._network_cleanup,
+        ):
+            stub.reset()
 
     @pytest.fixture
-    def handler_with_set(self, protocol, data_store, set_handler):
+    def handler_with_set(self, protocol, mutable_data_store, set_handler):
         """Create RequestHandler with a SetHandler registered."""
         return RequestHandler(
             protocol,
-            data_store,
+            mutable_data_store,
             {"1.3.6.1.2.1.1:": set_handler},
         )
 
     async def test_testset_success(self, handler_with_set, protocol, set_handler):
         """TESTSET calls handler._network_test."""
-        with patch("snmpkit.agent.handlers.decode_testset_pdu") as mock_decode:
-            mock_decode.return_value = MockTestSetPdu([vb("1.3.6.1.2.1.1.1.0", 42)])
+        _CURRENT_PDU.set(MockTestSetPdu([vb("1.3.6.1.2.1.1.1.0", 42)]))
 
-            await handler_with_set.handle_testset(MockHeader(), b"")
+        await handler_with_set.handle_testset(MockHeader(), b"")
 
-            set_handler._network_test.assert_called_once()
-            # No error
-            protocol.send_response.assert_called_once()
-            kwargs = protocol.send_response.call_args.kwargs
-            assert kwargs.get("error", 0) == 0
+        assert set_handler._network_test.n == 1
+        # No error
+        assert len(protocol.calls) == 1
+        kwargs = _last_kwargs(protocol)
+        assert kwargs.get("error", 0) == 0
 
     async def test_testset_not_writable(self, handler, protocol):
         """TESTSET returns NOT_WRITABLE for unregistered OID."""
-        with patch("snmpkit.agent.handlers.decode_testset_pdu") as mock_decode:
-            mock_decode.return_value = MockTestSetPdu(
+        _CURRENT_PDU.set(
+            MockTestSetPdu(
                 [
                     vb("1.3.6.1.9.9.9.0", 42)  # No handler for this OID
                 ]
             )
+        )
 
-            await handler.handle_testset(MockHeader(), b"")
+        await handler.handle_testset(MockHeader(), b"")
 
-            kwargs = protocol.send_response.call_args.kwargs
-            assert kwargs.get("error") == NOT_WRITABLE
-            assert kwargs.get("index") == 1
+        kwargs = _last_kwargs(protocol)
+        assert kwargs.get("error") == NOT_WRITABLE
+        assert kwargs.get("index") == 1
 
     async def test_testset_wrong_value(self, handler_with_set, protocol, set_handler):
         """TESTSET returns WRONG_VALUE when handler raises."""
         set_handler._network_test.side_effect = ValueError("Invalid")
 
-        with patch("snmpkit.agent.handlers.decode_testset_pdu") as mock_decode:
-            mock_decode.return_value = MockTestSetPdu([vb("1.3.6.1.2.1.1.1.0", 42)])
+        _CURRENT_PDU.set(MockTestSetPdu([vb("1.3.6.1.2.1.1.1.0", 42)]))
 
-            await handler_with_set.handle_testset(MockHeader(), b"")
+        await handler_with_set.handle_testset(MockHeader(), b"")
 
-            kwargs = protocol.send_response.call_args.kwargs
-            assert kwargs.get("error") == WRONG_VALUE
+        kwargs = _last_kwargs(protocol)
+        assert kwargs.get("error") == WRONG_VALUE
 
     async def test_commitset(self, handler_with_set, protocol, set_handler):
         """COMMITSET calls handler._network_commit."""
         await handler_with_set.handle_commitset(MockHeader())
 
-        set_handler._network_commit.assert_called_once()
-        protocol.send_response.assert_called_once()
+        assert set_handler._network_commit.n == 1
+        assert len(protocol.calls) == 1
 
     async def test_undoset(self, handler_with_set, protocol, set_handler):
         """UNDOSET calls handler._network_undo."""
         await handler_with_set.handle_undoset(MockHeader())
 
-        set_handler._network_undo.assert_called_once()
-        protocol.send_response.assert_called_once()
+        assert set_handler._network_undo.n == 1
+        assert len(protocol.calls) == 1
 
     async def test_cleanupset(self, handler_with_set, protocol, set_handler):
         """CLEANUPSET calls handler._network_cleanup."""
         await handler_with_set.handle_cleanupset(MockHeader())
 
-        set_handler._network_cleanup.assert_called_once()
-        protocol.send_response.assert_called_once()
+        assert set_handler._network_cleanup.n == 1
+        assert len(protocol.calls) == 1
 
 
-class TestRequestHandlerFindSetHandler:
-    """Tests for _find_set_handler method."""
+class TestRequestHandlerDispatch:
+    """Tests for routing PDUs by type."""
 
-    def test_find_exact_match(self, protocol, data_store):
-        """Find handler for exact OID prefix match."""
-        mock_handler = MagicMock()
-        handler = RequestHandler(
-            protocol,
-            data_store,
-            {"1.3.6.1.2.1.1:": mock_handler},
-        )
+    async def test_dispatch_routes_by_type(self, handler, protocol):
+        """dispatch calls the handler registered for the PDU type."""
+        header = MockHeader()
+        header.pdu_type = PduTypes.GET
 
-        result = handler._find_set_handler("1.3.6.1.2.1.1.1.0")
-        assert result is mock_handler
+        _CURRENT_PDU.set(MockGetPdu([_RANGE_1]))
+        assert await handler.dispatch(header, b"") is True
 
-    def test_find_no_match(self, protocol, data_store):
-        """Return None when no handler matches."""
-        handler = RequestHandler(
-            protocol,
-            data_store,
-            {"1.3.6.1.2.1.1:": MagicMock()},
-        )
+        assert len(protocol.calls) == 1
 
-        result = handler._find_set_handler("1.3.6.1.9.9.9.0")
-        assert result is None
+    async def test_dispatch_header_only_types(self, handler, protocol):
+        """Set-phase PDUs are dispatched without their payload."""
+        header = MockHeader()
+        header.pdu_type = PduTypes.COMMIT_SET
+
+        assert await handler.dispatch(header, b"ignored") is True
+        assert protocol.calls == [(header, [], {})]
+
+    async def test_dispatch_uses_overridden_handler(self, protocol, data_store):
+        """dispatch calls a subclass override rather than the base handler."""
+        seen = []
+
+        class CustomHandler(RequestHandler):
+            async def handle_get(self, header, payload):
+                seen.append((header, payload))
+
+        header = MockHeader()
+        header.pdu_type = PduTypes.GET
+
+        assert await CustomHandler(protocol, data_store, {}).dispatch(header, b"raw") is True
+        assert seen == [(header, b"raw")]
+        assert protocol.calls == []
+
+    async def test_dispatch_unhandled_type(self, handler, protocol):
+        """dispatch reports types it does not handle."""
+        header = MockHeader()
+        header.pdu_type = PduTypes.PING
+
+        assert await handler.dispatch(header, b"") is False
+        assert protocol.calls == []
 
-    def test_find_multiple_handlers(self, protocol, data_store):
-        """Find correct handler among multiple registrations."""
-        handler1 = MagicMock()
-        handler2 = MagicMock()
-        handler = RequestHandler(
-            protocol,
-            data_store,
-            {
-                "1.3.6.1.2.1.1:": handler1,
-                "1.3.6.1.4.1:": handler2,
-            },
-        )
 
-        assert handler._find_set_handler("1.3.6.1.2.1.1.5.0") is handler1
-        assert handler._find_set_handler("1.3.6.1.4.1.12345.0") is handler2
+@pytest.fixture(scope="module")
+def handler_shared(data_store):
+    """RequestHandler with two set handler registrations."""
+    return RequestHandler(
+        _FakeProtocol(),
+        data_store,
+        {
+            "1.3.6.1.2.1.1:": _H1,
+            "1.3.6.1.4.1:": _H2,
+        },
+    )
+
+
+class TestRequestHandlerFindSetHandler:
+    """Tests for _find_set_handler method."""
+
+    @pytest.mark.parametrize(
+        "oid,expected",
+        [
+            ("1.3.6.1.2.1.1.1.0", _H1),
+            ("1.3.6.1.2.1.1.5.0", _H1),
+            ("1.3.6.1.4.1.12345.0", _H2),
+            ("1.3.6.1.9.9.9.0", None),
+        ],
+        ids=["exact", "same-subtree", "second-registration", "no-match"],
+    )
+    def test_find_set_handler(self, handler_shared, oid, expected):
+        """The handler registered for the OID's subtree is returned, else None."""
+        assert handler_shared._find_set_handler(oid) is expected
@@ -1,7 +1,8 @@
 """Unit Tests for the Protocol class."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
 from snmpkit.agent.exceptions import ConnectionError, ProtocolError, RegistrationError, SessionError
@@ -35,12 +36,44 @@ class MockResponse:
         self.is_error = is_error
 
 
+class _FakeWriter:
+    """Stream writer stand-in that records writes, drains and closes."""
+
+    def __init__(self):
+        self.write = MagicMock()
+        self.close = MagicMock()
+        self.drain_count = 0
+        self.wait_closed_count = 0
+
+    async def drain(self):
+        self.drain_count += 1
+
+    async def wait_closed(self):
+        self.wait_closed_count += 1
+
+
+def _coro_returning(value):
+    """Build an async callable that returns value, to stand in for a coroutine method."""
+
+    async def _return(*args, **kwargs):
+        return value
+
+    return _return
+
+
 @pytest.fixture
 def protocol():
     """Create a fresh Protocol for each test."""
     return Protocol("test-agent", "/var/agentx/master", 5)
 
 
+@pytest.fixture
+def wired_protocol(protocol):
+    """Protocol with a fake writer attached."""
+    protocol._writer = _FakeWriter()
+    return protocol
+
+
 class TestProtocolInit:
     """Tests for Protocol initialization."""
 
@@ -83,17 +116,12 @@ class TestProtocolSend:
         with pytest.raises(SessionError, match="Not connected"):
             await protocol.send(b"test")
 
-    async def test_send_writes_data(self, protocol):
+    async def test_send_writes_data(self, wired_protocol):
         """send writes data and drains."""
-        mock_writer = MagicMock()
-        mock_writer.write = MagicMock()
-        mock_writer.drain = AsyncMock()
-        protocol._writer = mock_writer
-
-        await protocol.send(b"test data")
+        await wired_protocol.send(b"test data")
 
-        mock_writer.write.assert_called_once_with(b"test data")
-        mock_writer.drain.assert_called_once()
+        wired_protocol._writer.write.assert_called_once_with(b"test data")
+        assert wired_protocol._writer.drain_count == 1
 
 
 class TestProtocolRecvPdu:
@@ -121,54 +149,35 @@ class TestProtocolRecvPdu:
 class TestProtocolOpenSession:
     """Tests for open_session method."""
 
-    async def test_open_session_success(self, protocol):
+    async def test_open_session_success(self, wired_protocol):
         """open_session establishes session on success."""
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
-
-        with patch.object(protocol, "recv_pdu") as mock_recv:
-            mock_recv.return_value = (MockHeader(session_id=42), b"")
-            with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
-                mock_decode.return_value = MockResponse(is_error=False)
+        wired_protocol.recv_pdu = _coro_returning((MockHeader(session_id=42), b""))
+        with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
+            mock_decode.return_value = MockResponse(is_error=False)
 
-                await protocol.open_session()
+            await wired_protocol.open_session()
 
-        assert protocol._session_id == 42
+        assert wired_protocol._session_id == 42
 
-    async def test_open_session_no_response_raises(self, protocol):
+    async def test_open_session_no_response_raises(self, wired_protocol):
         """open_session raises ConnectionError on no response."""
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
+        wired_protocol.recv_pdu = _coro_returning(None)
+        with pytest.raises(ConnectionError, match="No response"):
+            await wired_protocol.open_session()
 
-        with patch.object(protocol, "recv_pdu", return_value=None):
-            with pytest.raises(ConnectionError, match="No response"):
-                await protocol.open_session()
-
-    async def test_open_session_wrong_pdu_type_raises(self, protocol):
+    async def test_open_session_wrong_pdu_type_raises(self, wired_protocol):
         """open_session raises ProtocolError on wrong PDU type."""
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
-
-        with patch.object(protocol, "recv_pdu") as mock_recv:
-            mock_recv.return_value = (MockHeader(pdu_type=PduTypes.GET), b"")
-            with pytest.raises(ProtocolError, match="Expected Response"):
-                await protocol.open_session()
+        wired_protocol.recv_pdu = _coro_returning((MockHeader(pdu_type=PduTypes.GET), b""))
+        with pytest.raises(ProtocolError, match="Expected Response"):
+            await wired_protocol.open_session()
 
-    async def test_open_session_error_response_raises(self, protocol):
+    async def test_open_session_error_response_raises(self, wired_protocol):
         """open_session raises ConnectionError on error response."""
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
-
-        with patch.object(protocol, "recv_pdu") as mock_recv:
-            mock_recv.return_value = (MockHeader(), b"")
-            with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
-                mock_decode.return_value = MockResponse(error=256, is_error=True)
-                with pytest.raises(ConnectionError, match="Open failed"):
-                    await protocol.open_session()
+        wired_protocol.recv_pdu = _coro_returning((MockHeader(), b""))
+        with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
+            mock_decode.return_value = MockResponse(error=256, is_error=True)
+            with pytest.raises(ConnectionError, match="Open failed"):
+                await wired_protocol.open_session()
 
 
 class TestProtocolCloseSession:
@@ -178,43 +187,33 @@ class TestProtocolCloseSession:
         """close_session does nothing if no session."""
         await protocol.close_session()  # Should not raise
 
-    async def test_close_session_sends_close_pdu(self, protocol):
+    async def test_close_session_sends_close_pdu(self, wired_protocol):
         """close_session sends Close PDU."""
-        protocol._session_id = 42
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
+        wired_protocol._session_id = 42
 
-        await protocol.close_session()
+        await wired_protocol.close_session()
 
-        protocol._writer.write.assert_called_once()
-        assert protocol._session_id == 0
+        wired_protocol._writer.write.assert_called_once()
+        assert wired_protocol._session_id == 0
 
 
 class TestProtocolPing:
     """Tests for ping method."""
 
-    async def test_ping_success(self, protocol):
+    async def test_ping_success(self, wired_protocol):
         """ping succeeds on valid response."""
-        protocol._session_id = 1
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
+        wired_protocol._session_id = 1
 
-        with patch.object(protocol, "recv_pdu") as mock_recv:
-            mock_recv.return_value = (MockHeader(), b"")
-            await protocol.ping()  # Should not raise
+        wired_protocol.recv_pdu = _coro_returning((MockHeader(), b""))
+        await wired_protocol.ping()  # Should not raise
 
-    async def test_ping_no_response_raises(self, protocol):
+    async def test_ping_no_response_raises(self, wired_protocol):
         """ping raises ConnectionError on no response."""
-        protocol._session_id = 1
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
+        wired_protocol._session_id = 1
 
-        with patch.object(protocol, "recv_pdu", return_value=None):
-            with pytest.raises(ConnectionError, match="No response"):
-                await protocol.ping()
+        wired_protocol.recv_pdu = _coro_returning(None)
+        with pytest.raises(ConnectionError, match="No response"):
+            await wired_protocol.ping()
 
 
 class TestProtocolRegisterOid:
@@ -223,111 +222,83 @@ class TestProtocolRegisterOid:
     @pytest.fixture
     def mock_registration(self):
         """Create a mock Registration."""
-        reg = MagicMock()
-        reg.oid = "1.3.6.1.4.1.12345"
-        reg.priority = 127
-        reg.context = None
-        return reg
+        return SimpleNamespace(oid="1.3.6.1.4.1.12345", priority=127, context=None)
 
-    async def test_register_oid_success(self, protocol, mock_registration):
+    async def test_register_oid_success(self, wired_protocol, mock_registration):
         """register_oid succeeds on valid response."""
-        protocol._session_id = 1
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
-
-        with patch.object(protocol, "recv_pdu") as mock_recv:
-            mock_recv.return_value = (MockHeader(), b"")
-            with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
-                mock_decode.return_value = MockResponse(is_error=False)
-                await protocol.register_oid(mock_registration)
-
-    async def test_register_oid_no_response_raises(self, protocol, mock_registration):
+        wired_protocol._session_id = 1
+
+        wired_protocol.recv_pdu = _coro_returning((MockHeader(), b""))
+        with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
+            mock_decode.return_value = MockResponse(is_error=False)
+            await wired_protocol.register_oid(mock_registration)
+
+    async def test_register_oid_no_response_raises(self, wired_protocol, mock_registration):
         """register_oid raises RegistrationError on no response."""
-        protocol._session_id = 1
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
+        wired_protocol._session_id = 1
 
-        with patch.object(protocol, "recv_pdu", return_value=None):
-            with pytest.raises(RegistrationError, match="No response"):
-                await protocol.register_oid(mock_registration)
+        wired_protocol.recv_pdu = _coro_returning(None)
+        with pytest.raises(RegistrationError, match="No response"):
+            await wired_protocol.register_oid(mock_registration)
 
-    async def test_register_oid_error_response_raises(self, protocol, mock_registration):
+    async def test_register_oid_error_response_raises(self, wired_protocol, mock_registration):
         """register_oid raises RegistrationError on error response."""
-        protocol._session_id = 1
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
+        wired_protocol._session_id = 1
 
-        with patch.object(protocol, "recv_pdu") as mock_recv:
-            mock_recv.return_value = (MockHeader(), b"")
-            with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
-                mock_decode.return_value = MockResponse(error=263, is_error=True)
-                with pytest.raises(RegistrationError, match="Registration failed"):
-                    await protocol.register_oid(mock_registration)
+        wired_protocol.recv_pdu = _coro_returning((MockHeader(), b""))
+        with patch("snmpkit.agent.protocol.decode_response_pdu") as mock_decode:
+            mock_decode.return_value = MockResponse(error=263, is_error=True)
+            with pytest.raises(RegistrationError, match="Registration failed"):
+                await wired_protocol.register_oid(mock_registration)
 
 
 class TestProtocolSendResponse:
     """Tests for send_response method."""
 
-    async def test_send_response_encodes_and_sends(self, protocol):
+    async def test_send_response_encodes_and_sends(self, wired_protocol):
         """send_response encodes PDU and sends."""
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
-
         header = MockHeader(session_id=1, transaction_id=2, packet_id=3)
         varbinds = [VarBind(Oid("1.3.6.1"), Value.Integer(42))]
 
-        await protocol.send_response(header, varbinds)
+        await wired_protocol.send_response(header, varbinds)
 
-        protocol._writer.write.assert_called_once()
-        protocol._writer.drain.assert_called_once()
+        wired_protocol._writer.write.assert_called_once()
+        assert wired_protocol._writer.drain_count == 1
 
 
 class TestProtocolSendNotify:
     """Tests for send_notify method."""
 
-    async def test_send_notify_encodes_and_sends(self, protocol):
+    async def test_send_notify_encodes_and_sends(self, wired_protocol):
         """send_notify encodes Notify PDU and sends."""
-        protocol._session_id = 1
-        protocol._writer = MagicMock()
-        protocol._writer.write = MagicMock()
-        protocol._writer.drain = AsyncMock()
+        wired_protocol._session_id = 1
 
         varbinds = [VarBind(Oid("1.3.6.1.0.1"), Value.Integer(1))]
-        await protocol.send_notify(varbinds)
+        await wired_protocol.send_notify(varbinds)
 
-        protocol._writer.write.assert_called_once()
-        protocol._writer.drain.assert_called_once()
+        wired_protocol._writer.write.assert_called_once()
+        assert wired_protocol._writer.drain_count == 1
 
 
 class TestProtocolDisconnect:
     """Tests for disconnect method."""
 
-    async def test_disconnect_closes_writer(self, protocol):
+    async def test_disconnect_closes_writer(self, wired_protocol):
         """disconnect closes the writer."""
-        mock_writer = MagicMock()
-        mock_writer.close = MagicMock()
-        mock_writer.wait_closed = AsyncMock()
-        protocol._writer = mock_writer
-        protocol._reader = MagicMock()
+        writer = wired_protocol._writer
+        wired_protocol._reader = MagicMock()
 
-        await protocol.disconnect()
+        await wired_protocol.disconnect()
 
-        mock_writer.close.assert_called_once()
-        mock_writer.wait_closed.assert_called_once()
-        assert protocol._writer is None
-        assert protocol._reader is None
+        writer.close.assert_called_once()
+        assert writer.wait_closed_count == 1
+        assert wired_protocol._writer is None
+        assert wired_protocol._reader is None
 
-    async def test_disconnect_clears_buffer(self, protocol):
+    async def test_disconnect_clears_buffer(self, wired_protocol):
         """disconnect clears receive buffer."""
-        protocol._recv_buf = b"leftover data"
-        protocol._writer = MagicMock()
-        protocol._writer.close = MagicMock()
-        protocol._writer.wait_closed = AsyncMock()
+        wired_protocol._recv_buf = b"leftover data"
 
-        await protocol.disconnect()
+        await wired_protocol.disconnect()
 
-        assert protocol._recv_buf == b""
+        assert wired_protocol._recv_buf == b""
@@ -1,8 +1,17 @@
 """Unit Tests for the SetHandler class."""
 
+import re
+
 import pytest
 from snmpkit.agent.set_handler import SetHandler
 
+_INVALID_VALUE_RE = re.compile("Invalid value")
+
+# Transaction keys as built by SetHandler._make_tid(session_id, transaction_id)
+_TID_1_1 = (1, 1)
+_TID_1_2 = (1, 2)
+_TID_2_1 = (2, 1)
+
 
 class MockAgent:
     """Mock agent for testing."""
@@ -10,20 +19,40 @@ class MockAgent:
     pass
 
 
+# MockAgent is stateless, so every handler can bind to the same instance
+_MOCK_AGENT = MockAgent()
+
+
+def make_handler(**hooks):
+    """Create a bound SetHandler with the given test/commit/undo/cleanup overrides."""
+    h = SetHandler()
+    for name, fn in hooks.items():
+        setattr(h, name, fn)
+    h._bind(_MOCK_AGENT, "1.3.6.1")
+    return h
+
+
 @pytest.fixture
 def handler():
     """Create a fresh SetHandler."""
     return SetHandler()
 
 
-@pytest.fixture
-def bound_handler():
-    """Create a SetHandler bound to a mock agent."""
+@pytest.fixture(scope="module")
+def shared_handler():
+    """SetHandler bound to a mock agent, shared by the module."""
     h = SetHandler()
-    h._bind(MockAgent(), "1.3.6.1.4.1.12345")
+    h._bind(_MOCK_AGENT, "1.3.6.1.4.1.12345")
     return h
 
 
+@pytest.fixture
+def bound_handler(shared_handler):
+    """The shared SetHandler with transactions from earlier tests dropped."""
+    shared_handler._transactions.clear()
+    return shared_handler
+
+
 class TestSetHandlerBasic:
     """Basic SetHandler functionality tests."""
 
@@ -35,16 +64,16 @@ class TestSetHandlerBasic:
 
     def test_bind(self, handler):
         """Bind sets agent and base OID."""
-        agent = MockAgent()
+        agent = _MOCK_AGENT
         handler._bind(agent, "1.3.6.1.4.1.12345")
 
         assert handler._agent is agent
         assert handler._base_oid == "1.3.6.1.4.1.12345"
 
     def test_make_tid(self, handler):
-        """Transaction ID is session_id_transaction_id."""
+        """Transaction ID is the (session_id, transaction_id) pair."""
         tid = handler._make_tid(123, 456)
-        assert tid == "123_456"
+        assert tid == (123, 456)
 
 
 class TestSetHandlerTransaction:
@@ -54,145 +83,129 @@ class TestSetHandlerTransaction:
         """_network_test stores the transaction."""
         await bound_handler._network_test(1, 1, "1.3.6.1.4.1.12345.1.0", 42)
 
-        assert "1_1" in bound_handler._transactions
-        oid, value = bound_handler._transactions["1_1"]
-        assert oid == "1.3.6.1.4.1.12345.1.0"
-        assert value == 42
+        assert bound_handler._transactions.get(_TID_1_1) == ("1.3.6.1.4.1.12345.1.0", 42)
 
     async def test_network_test_replaces_previous(self, bound_handler):
         """_network_test replaces previous transaction with same ID."""
         await bound_handler._network_test(1, 1, "1.3.6.1.1.0", "first")
         await bound_handler._network_test(1, 1, "1.3.6.1.2.0", "second")
 
-        oid, value = bound_handler._transactions["1_1"]
-        assert oid == "1.3.6.1.2.0"
-        assert value == "second"
+        assert bound_handler._transactions.get(_TID_1_1) == ("1.3.6.1.2.0", "second")
 
-    async def test_network_commit_calls_commit(self, bound_handler):
+    async def test_network_commit_calls_commit(self):
         """_network_commit calls commit method."""
         commits = []
 
-        class TrackedHandler(SetHandler):
-            async def commit(self, oid, value):
-                commits.append((oid, value))
+        async def commit(oid, value):
+            commits.append((oid, value))
 
-        handler = TrackedHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+        handler = make_handler(commit=commit)
         await handler._network_test(1, 1, "1.3.6.1.1.0", 42)
         await handler._network_commit(1, 1)
 
         assert commits == [("1.3.6.1.1.0", 42)]
-        assert "1_1" not in handler._transactions
+        assert handler._transactions.get(_TID_1_1) is None
 
     async def test_network_commit_no_transaction(self, bound_handler):
         """_network_commit does nothing if no transaction."""
         # Should not raise
         await bound_handler._network_commit(1, 999)
 
-    async def test_network_undo_calls_undo(self, bound_handler):
+    async def test_network_undo_calls_undo(self):
         """_network_undo calls undo method."""
         undos = []
 
-        class TrackedHandler(SetHandler):
-            async def undo(self, oid):
-                undos.append(oid)
+        async def undo(oid):
+            undos.append(oid)
 
-        handler = TrackedHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+        handler = make_handler(undo=undo)
         await handler._network_test(1, 1, "1.3.6.1.1.0", 42)
         await handler._network_undo(1, 1)
 
         assert undos == ["1.3.6.1.1.0"]
-        assert "1_1" not in handler._transactions
+        assert handler._transactions.get(_TID_1_1) is None
 
-    async def test_network_cleanup_calls_cleanup(self, bound_handler):
+    async def test_network_cleanup_calls_cleanup(self):
         """_network_cleanup calls cleanup method."""
         cleanups = []
 
-        class TrackedHandler(SetHandler):
-            async def cleanup(self, oid):
-                cleanups.append(oid)
+        async def cleanup(oid):
+            cleanups.append(oid)
 
-        handler = TrackedHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+        handler = make_handler(cleanup=cleanup)
         await handler._network_test(1, 1, "1.3.6.1.1.0", 42)
         await handler._network_cleanup(1, 1)
 
         assert cleanups == ["1.3.6.1.1.0"]
-        assert "1_1" not in handler._transactions
+        assert handler._transactions.get(_TID_1_1) is None
 
 
-class TestSetHandlerLifecycle:
-    """Tests for complete SET transaction lifecycles."""
+class LoggingHandler(SetHandler):
+    """SetHandler that records every hook call in self.log."""
 
-    async def test_successful_set(self):
-        """Complete successful SET: test -> commit."""
-        log = []
+    def __init__(self):
+        super().__init__()
+        self.log = []
 
-        class LoggingHandler(SetHandler):
-            async def test(self, oid, value):
-                log.append(("test", oid, value))
+    async def test(self, oid, value):
+        self.log.append(("test", oid, value))
 
-            async def commit(self, oid, value):
-                log.append(("commit", oid, value))
+    async def commit(self, oid, value):
+        self.log.append(("commit", oid, value))
 
-        handler = LoggingHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+    async def undo(self, oid):
+        self.log.append(("undo", oid))
 
-        await handler._network_test(1, 1, "1.3.6.1.1.0", 42)
-        await handler._network_commit(1, 1)
+    async def cleanup(self, oid):
+        self.log.append(("cleanup", oid))
 
-        assert log == [
-            ("test", "1.3.6.1.1.0", 42),
-            ("commit", "1.3.6.1.1.0", 42),
-        ]
 
-    async def test_failed_set_with_undo(self):
-        """Failed SET: test -> undo."""
-        log = []
+@pytest.fixture(scope="module")
+def logging_handler():
+    """LoggingHandler bound to a mock agent, shared by the module."""
+    h = LoggingHandler()
+    h._bind(_MOCK_AGENT, "1.3.6.1")
+    return h
 
-        class LoggingHandler(SetHandler):
-            async def test(self, oid, value):
-                log.append(("test", oid, value))
 
-            async def undo(self, oid):
-                log.append(("undo", oid))
+class TestSetHandlerLifecycle:
+    """Tests for complete SET transaction lifecycles."""
 
-        handler = LoggingHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+    @pytest.fixture(autouse=True)
+    def _reset_log(self, logging_handler):
+        """Start each test with no log and no open transactions."""
+        logging_handler.log.clear()
+        logging_handler._transactions.clear()
 
-        await handler._network_test(1, 1, "1.3.6.1.1.0", 42)
-        await handler._network_undo(1, 1)
+    async def test_successful_set(self, logging_handler):
+        """Complete successful SET: test -> commit."""
+        await logging_handler._network_test(1, 1, "1.3.6.1.1.0", 42)
+        await logging_handler._network_commit(1, 1)
 
-        assert log == [
+        assert logging_handler.log == [
             ("test", "1.3.6.1.1.0", 42),
-            ("undo", "1.3.6.1.1.0"),
+            ("commit", "1.3.6.1.1.0", 42),
         ]
 
-    async def test_cleanup_after_commit(self):
-        """Cleanup after commit."""
-        log = []
-
-        class LoggingHandler(SetHandler):
-            async def test(self, oid, value):
-                log.append(("test", oid, value))
-
-            async def commit(self, oid, value):
-                log.append(("commit", oid, value))
-
-            async def cleanup(self, oid):
-                log.append(("cleanup", oid))
+    async def test_failed_set_with_undo(self, logging_handler):
+        """Failed SET: test -> undo."""
+        await logging_handler._network_test(1, 1, "1.3.6.1.1.0", 42)
+        await logging_handler._network_undo(1, 1)
 
-        handler = LoggingHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+        assert logging_handler.log == [
+            ("test", "1.3.6.1.1.0", 42),
+            ("undo", "1.3.6.1.1.0"),
+        ]
 
-        await handler._network_test(1, 1, "1.3.6.1.1.0", 42)
-        await handler._network_commit(1, 1)
+    async def test_cleanup_after_commit(self, logging_handler):
+        """Cleanup after commit."""
+        await logging_handler._network_test(1, 1, "1.3.6.1.1.0", 42)
+        await logging_handler._network_commit(1, 1)
         # Cleanup called on new test after commit
-        await handler._network_test(1, 2, "1.3.6.1.1.0", 100)
-        await handler._network_cleanup(1, 2)
+        await logging_handler._network_test(1, 2, "1.3.6.1.1.0", 100)
+        await logging_handler._network_cleanup(1, 2)
 
-        assert ("cleanup", "1.3.6.1.1.0") in log
+        assert ("cleanup", "1.3.6.1.1.0") in logging_handler.log
 
 
 class TestSetHandlerRejection:
@@ -201,18 +214,16 @@ class TestSetHandlerRejection:
     async def test_test_exception_rejects(self):
         """Exception in test() rejects the SET."""
 
-        class RejectingHandler(SetHandler):
-            async def test(self, oid, value):
-                raise ValueError("Invalid value")
+        async def test(oid, value):
+            raise ValueError("Invalid value")
 
-        handler = RejectingHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+        handler = make_handler(test=test)
 
-        with pytest.raises(ValueError, match="Invalid value"):
+        with pytest.raises(ValueError, match=_INVALID_VALUE_RE):
             await handler._network_test(1, 1, "1.3.6.1.1.0", 42)
 
         # Transaction should not be stored on failure
-        assert "1_1" not in handler._transactions
+        assert handler._transactions.get(_TID_1_1) is None
 
 
 class TestSetHandlerMultipleTransactions:
@@ -221,41 +232,39 @@ class TestSetHandlerMultipleTransactions:
     async def test_different_sessions(self):
         """Different sessions have separate transactions."""
         handler = SetHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+        handler._bind(_MOCK_AGENT, "1.3.6.1")
 
         await handler._network_test(1, 1, "1.3.6.1.1.0", "session1")
         await handler._network_test(2, 1, "1.3.6.1.2.0", "session2")
 
-        assert handler._transactions["1_1"][1] == "session1"
-        assert handler._transactions["2_1"][1] == "session2"
+        assert handler._transactions[_TID_1_1][1] == "session1"
+        assert handler._transactions[_TID_2_1][1] == "session2"
 
     async def test_different_transaction_ids(self):
         """Different transaction IDs are tracked separately."""
         handler = SetHandler()
-        handler._bind(MockAgent(), "1.3.6.1")
+        handler._bind(_MOCK_AGENT, "1.3.6.1")
 
         await handler._network_test(1, 1, "1.3.6.1.1.0", "tx1")
         await handler._network_test(1, 2, "1.3.6.1.2.0", "tx2")
 
-        assert handler._transactions["1_1"][1] == "tx1"
-        assert handler._transactions["1_2"][1] == "tx2"
+        assert handler._transactions[_TID_1_1][1] == "tx1"
+        assert handler._transactions[_TID_1_2][1] == "tx2"
 
 
 class TestSetHandlerDefaultMethods:
     """Tests for default method implementations."""
 
-    async def test_default_test_passes(self, bound_handler):
-        """Default test() does nothing (accepts all)."""
-        await bound_handler.test("1.3.6.1.1.0", 42)  # Should not raise
-
-    async def test_default_commit_passes(self, bound_handler):
-        """Default commit() does nothing."""
-        await bound_handler.commit("1.3.6.1.1.0", 42)  # Should not raise
-
-    async def test_default_undo_passes(self, bound_handler):
-        """Default undo() does nothing."""
-        await bound_handler.undo("1.3.6.1.1.0")  # Should not raise
-
-    async def test_default_cleanup_passes(self, bound_handler):
-        """Default cleanup() does nothing."""
-        await bound_handler.cleanup("1.3.6.1.1.0")  # Should not raise
+    @pytest.mark.parametrize(
+        "method,args",
+        [
+            ("test", ("1.3.6.1.1.0", 42)),
+            ("commit", ("1.3.6.1.1.0", 42)),
+            ("undo", ("1.3.6.1.1.0",)),
+            ("cleanup", ("1.3.6.1.1.0",)),
+        ],
+        ids=["test", "commit", "undo", "cleanup"],
+    )
+    async def test_default_noops(self, bound_handler, method, args):
+        """Default test/commit/undo/cleanup do nothing (test() accepts all)."""
+        await getattr(bound_handler, method)(*args)  # Should not raise
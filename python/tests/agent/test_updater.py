@@ -1,7 +1,9 @@
 """Unit Tests for the Updater class."""
 
+import re
+
 import pytest
-from snmpkit.agent.updater import Updater
+from snmpkit.agent.updater import Updater, _cached_octet_string
 from snmpkit.core import Oid, Value, VarBind
 
 
@@ -15,19 +17,41 @@ class MockAgent:
         self.traps_sent.append((oid, varbinds))
 
 
+_BASE_OID = "1.3.6.1.4.1.12345"
+_INT_42 = Value.Integer(42)
+
+_NOT_BOUND_RE = re.compile("not bound")
+
+_TRAP_OID = "1.3.6.1.4.1.12345.0.1"
+_TRAP_VB1 = VarBind(Oid("1.3.6.1.4.1.12345.1.0"), _INT_42)
+_TRAP_VB2 = VarBind(Oid("1.3.6.1.4.1.12345.2.0"), Value.OctetString(b"test"))
+
+
 @pytest.fixture
 def updater():
     """Create a fresh Updater for each test."""
     return Updater()
 
 
+@pytest.fixture(scope="module")
+def mock_agent():
+    """MockAgent shared by the module; its sent traps are cleared per test."""
+    return MockAgent()
+
+
+@pytest.fixture(scope="module")
+def shared_updater():
+    """Updater shared by the module, reset by bound_updater before each use."""
+    return Updater()
+
+
 @pytest.fixture
-def bound_updater():
-    """Create an Updater bound to a mock agent."""
-    u = Updater()
-    agent = MockAgent()
-    u._bind(agent, "1.3.6.1.4.1.12345")
-    return u, agent
+def bound_updater(shared_updater, mock_agent):
+    """The shared Updater, cleared and bound to the mock agent."""
+    shared_updater.clear()
+    shared_updater._bind(mock_agent, _BASE_OID)
+    mock_agent.traps_sent.clear()
+    return shared_updater, mock_agent
 
 
 class TestUpdaterBasic:
@@ -39,13 +63,12 @@ class TestUpdaterBasic:
         assert updater._agent is None
         assert updater._base_oid == ""
 
-    def test_bind(self, updater):
+    def test_bind(self, updater, mock_agent):
         """Bind sets agent and base OID."""
-        agent = MockAgent()
-        updater._bind(agent, "1.3.6.1.4.1.12345")
+        updater._bind(mock_agent, _BASE_OID)
 
-        assert updater._agent is agent
-        assert updater._base_oid == "1.3.6.1.4.1.12345"
+        assert updater._agent is mock_agent
+        assert updater._base_oid == _BASE_OID
 
     def test_clear(self, updater):
         """Clear removes all values."""
@@ -60,71 +83,90 @@ class TestUpdaterBasic:
 class TestUpdaterSetMethods:
     """Tests for set_* value methods."""
 
-    def test_set_integer(self, updater):
-        """set_INTEGER stores Integer value."""
-        updater.set_INTEGER("1.0", 42)
-        assert updater._values["1.0"] == Value.Integer(42)
-
-    def test_set_integer_negative(self, updater):
-        """set_INTEGER handles negative values."""
-        updater.set_INTEGER("1.0", -12345)
-        assert updater._values["1.0"] == Value.Integer(-12345)
-
-    def test_set_octetstring_bytes(self, updater):
-        """set_OCTETSTRING stores bytes."""
-        updater.set_OCTETSTRING("1.0", b"hello")
-        assert updater._values["1.0"] == Value.OctetString(b"hello")
-
-    def test_set_octetstring_str(self, updater):
-        """set_OCTETSTRING converts str to UTF-8 bytes."""
-        updater.set_OCTETSTRING("1.0", "hello")
-        assert updater._values["1.0"] == Value.OctetString(b"hello")
-
-    def test_set_octetstring_unicode(self, updater):
-        """set_OCTETSTRING handles unicode."""
-        updater.set_OCTETSTRING("1.0", "héllo")
-        assert updater._values["1.0"] == Value.OctetString("héllo".encode("utf-8"))
-
-    def test_set_objectidentifier(self, updater):
-        """set_OBJECTIDENTIFIER stores OID value."""
-        updater.set_OBJECTIDENTIFIER("1.0", "1.3.6.1.4.1.12345")
-        assert updater._values["1.0"] == Value.ObjectIdentifier(Oid("1.3.6.1.4.1.12345"))
-
-    def test_set_ipaddress(self, updater):
-        """set_IPADDRESS stores IP address."""
-        updater.set_IPADDRESS("1.0", "192.168.1.1")
-        assert updater._values["1.0"] == Value.IpAddress(192, 168, 1, 1)
+    @pytest.mark.parametrize(
+        "method,arg,expected",
+        [
+            ("set_INTEGER", 42, _INT_42),
+            ("set_INTEGER", -12345, Value.Integer(-12345)),
+            ("set_OCTETSTRING", b"hello", Value.OctetString(b"hello")),
+            ("set_OCTETSTRING", "hello", Value.OctetString(b"hello")),
+            ("set_OCTETSTRING", "héllo", Value.OctetString("héllo".encode("utf-8"))),
+            (
+                "set_OBJECTIDENTIFIER",
+                "1.3.6.1.4.1.12345",
+                Value.ObjectIdentifier(Oid("1.3.6.1.4.1.12345")),
+            ),
+            ("set_IPADDRESS", "192.168.1.1", Value.IpAddress(192, 168, 1, 1)),
+            ("set_COUNTER32", 4294967295, Value.Counter32(4294967295)),
+            ("set_GAUGE32", 1000000, Value.Gauge32(1000000)),
+            ("set_TIMETICKS", 123456789, Value.TimeTicks(123456789)),
+            ("set_OPAQUE", b"\x00\x01\x02\x03", Value.Opaque(b"\x00\x01\x02\x03")),
+            ("set_COUNTER64", 2**63 + 12345, Value.Counter64(2**63 + 12345)),
+        ],
+        ids=[
+            "integer",
+            "integer-negative",
+            "octetstring-bytes",
+            "octetstring-str",
+            "octetstring-unicode",
+            "objectidentifier",
+            "ipaddress",
+            "counter32",
+            "gauge32",
+            "timeticks",
+            "opaque",
+            "counter64",
+        ],
+    )
+    def test_set_value(self, updater, method, arg, expected):
+        """Each set_* method stores the matching Value type."""
+        getattr(updater, method)("1.0", arg)
+        assert updater._values["1.0"] == expected
+
+    def test_set_many_integer(self, updater):
+        """set_many_INTEGER stores every pair."""
+        updater.set_many_INTEGER([("1.0", 1), ("2.0", -2)])
+        assert updater._values == {"1.0": Value.Integer(1), "2.0": Value.Integer(-2)}
 
     def test_set_ipaddress_invalid(self, updater):
         """set_IPADDRESS rejects invalid IP."""
         with pytest.raises(ValueError):
             updater.set_IPADDRESS("1.0", "192.168.1")  # Missing octet
 
-    def test_set_counter32(self, updater):
-        """set_COUNTER32 stores Counter32 value."""
-        updater.set_COUNTER32("1.0", 4294967295)
-        assert updater._values["1.0"] == Value.Counter32(4294967295)
+    def test_repeated_values_share_instance(self, updater):
+        """Identical small values are reused rather than rebuilt."""
+        updater.set_INTEGER("1.0", 7)
+        updater.set_INTEGER("2.0", 7)
+        updater.set_OCTETSTRING("3.0", "up")
+        updater.set_OCTETSTRING("4.0", b"up")
+        assert updater._values["1.0"] is updater._values["2.0"]
+        assert updater._values["3.0"] is updater._values["4.0"]
+
+    def test_set_octetstring_bytearray(self, updater):
+        """set_OCTETSTRING accepts bytearray values."""
+        updater.set_OCTETSTRING("1.0", bytearray(b"hello"))
+        assert updater._values["1.0"] == Value.OctetString(b"hello")
 
-    def test_set_gauge32(self, updater):
-        """set_GAUGE32 stores Gauge32 value."""
-        updater.set_GAUGE32("1.0", 1000000)
-        assert updater._values["1.0"] == Value.Gauge32(1000000)
+    def test_small_octetstring_cached(self, updater):
+        """Short bytes values go through the OctetString cache."""
+        updater.set_OCTETSTRING("1.0", b"cache probe")
+        before = _cached_octet_string.cache_info()
+        updater.set_OCTETSTRING("2.0", b"cache probe")
+        after = _cached_octet_string.cache_info()
 
-    def test_set_timeticks(self, updater):
-        """set_TIMETICKS stores TimeTicks value."""
-        updater.set_TIMETICKS("1.0", 123456789)
-        assert updater._values["1.0"] == Value.TimeTicks(123456789)
+        assert after.hits == before.hits + 1
+        assert updater._values["1.0"] is updater._values["2.0"]
 
-    def test_set_opaque(self, updater):
-        """set_OPAQUE stores Opaque value."""
-        updater.set_OPAQUE("1.0", b"\x00\x01\x02\x03")
-        assert updater._values["1.0"] == Value.Opaque(b"\x00\x01\x02\x03")
+    def test_large_octetstring_not_cached(self, updater):
+        """Octet strings over the size limit bypass the cache."""
+        payload = b"x" * 4096
+        before = _cached_octet_string.cache_info()
+        updater.set_OCTETSTRING("1.0", payload)
+        after = _cached_octet_string.cache_info()
 
-    def test_set_counter64(self, updater):
-        """set_COUNTER64 stores Counter64 value."""
-        big_val = 2**63 + 12345
-        updater.set_COUNTER64("1.0", big_val)
-        assert updater._values["1.0"] == Value.Counter64(big_val)
+        assert after.currsize == before.currsize
+        assert after.misses == before.misses
+        assert updater._values["1.0"] == Value.OctetString(payload)
 
 
 class TestUpdaterGetValue:
@@ -133,7 +175,7 @@ class TestUpdaterGetValue:
     def test_get_value_exists(self, updater):
         """get_value returns stored value."""
         updater.set_INTEGER("1.0", 42)
-        assert updater.get_value("1.0") == Value.Integer(42)
+        assert updater.get_value("1.0") == _INT_42
 
     def test_get_value_missing(self, updater):
         """get_value returns None for missing OID."""
@@ -152,9 +194,8 @@ class TestUpdaterGetVarbinds:
         updater.set_INTEGER("1.0", 42)
         varbinds = updater.get_varbinds()
 
-        assert len(varbinds) == 1
-        assert str(varbinds[0].oid) == "1.0"
-        assert varbinds[0].value == Value.Integer(42)
+        assert [str(vb.oid) for vb in varbinds] == ["1.0"]
+        assert varbinds[0].value == _INT_42
 
     def test_get_varbinds_with_base_oid(self, bound_updater):
         """get_varbinds prepends base OID."""
@@ -162,8 +203,7 @@ class TestUpdaterGetVarbinds:
         updater.set_INTEGER("1.0", 42)
         varbinds = updater.get_varbinds()
 
-        assert len(varbinds) == 1
-        assert str(varbinds[0].oid) == "1.3.6.1.4.1.12345.1.0"
+        assert [str(vb.oid) for vb in varbinds] == ["1.3.6.1.4.1.12345.1.0"]
 
     def test_get_varbinds_multiple(self, bound_updater):
         """get_varbinds returns all values."""
@@ -172,8 +212,12 @@ class TestUpdaterGetVarbinds:
         updater.set_OCTETSTRING("2.0", b"test")
         updater.set_COUNTER64("3.0", 12345)
 
-        varbinds = updater.get_varbinds()
-        assert len(varbinds) == 3
+        oids = [str(vb.oid) for vb in updater.get_varbinds()]
+        assert oids == [
+            "1.3.6.1.4.1.12345.1.0",
+            "1.3.6.1.4.1.12345.2.0",
+            "1.3.6.1.4.1.12345.3.0",
+        ]
 
     def test_get_varbinds_returns_varbind_objects(self, bound_updater):
         """get_varbinds returns VarBind instances."""
@@ -185,6 +229,30 @@ class TestUpdaterGetVarbinds:
         assert isinstance(varbinds[0].oid, Oid)
         assert isinstance(varbinds[0].value, Value)
 
+    def test_get_varbinds_reuses_unchanged(self, bound_updater):
+        """Unchanged values reuse the VarBind built on the previous call."""
+        updater, _ = bound_updater
+        updater.set_INTEGER("1.0", 42)
+        updater.set_INTEGER("2.0", 1)
+        first = updater.get_varbinds()
+
+        updater.set_INTEGER("2.0", 2)
+        second = updater.get_varbinds()
+
+        assert second[0] is first[0]
+        assert second[1] is not first[1]
+        assert str(second[1].oid) == "1.3.6.1.4.1.12345.2.0"
+        assert second[1].value == Value.Integer(2)
+
+    def test_get_varbinds_after_rebind(self, bound_updater):
+        """Rebinding to a new base OID rebuilds the VarBinds."""
+        updater, agent = bound_updater
+        updater.set_INTEGER("1.0", 42)
+        updater.get_varbinds()
+
+        updater._bind(agent, "1.3.6.1.4.1.999")
+        assert str(updater.get_varbinds()[0].oid) == "1.3.6.1.4.1.999.1.0"
+
 
 class TestUpdaterTrap:
     """Tests for trap sending."""
@@ -193,30 +261,34 @@ class TestUpdaterTrap:
         """send_trap calls agent._send_trap."""
         updater, agent = bound_updater
 
-        vb = VarBind(Oid("1.3.6.1.4.1.12345.1.0"), Value.Integer(42))
-        await updater.send_trap("1.3.6.1.4.1.12345.0.1", vb)
+        await updater.send_trap(_TRAP_OID, _TRAP_VB1)
 
         assert len(agent.traps_sent) == 1
         trap_oid, trap_varbinds = agent.traps_sent[0]
-        assert trap_oid == "1.3.6.1.4.1.12345.0.1"
+        assert trap_oid == _TRAP_OID
         assert len(trap_varbinds) == 1
 
     async def test_send_trap_multiple_varbinds(self, bound_updater):
         """send_trap with multiple varbinds."""
         updater, agent = bound_updater
 
-        vb1 = VarBind(Oid("1.3.6.1.4.1.12345.1.0"), Value.Integer(42))
-        vb2 = VarBind(Oid("1.3.6.1.4.1.12345.2.0"), Value.OctetString(b"test"))
-        await updater.send_trap("1.3.6.1.4.1.12345.0.1", vb1, vb2)
+        await updater.send_trap(_TRAP_OID, _TRAP_VB1, _TRAP_VB2)
 
-        trap_oid, trap_varbinds = agent.traps_sent[0]
-        assert len(trap_varbinds) == 2
+        # All varbinds go out in one _send_trap call
+        assert agent.traps_sent == [(_TRAP_OID, [_TRAP_VB1, _TRAP_VB2])]
 
     async def test_send_trap_unbound_raises(self, updater):
         """send_trap raises when not bound to agent."""
-        vb = VarBind(Oid("1.3.6.1"), Value.Integer(1))
-        with pytest.raises(RuntimeError, match="not bound"):
-            await updater.send_trap("1.3.6.1.0.1", vb)
+        with pytest.raises(RuntimeError, match=_NOT_BOUND_RE):
+            await updater.send_trap(_TRAP_OID, _TRAP_VB1)
+
+
+class _SettingUpdater(Updater):
+    """Updater whose update() sets a couple of values."""
+
+    async def update(self):
+        self.set_INTEGER("1.0", 42)
+        self.set_OCTETSTRING("2.0", "hello")
 
 
 class TestUpdaterUpdate:
@@ -229,16 +301,10 @@ class TestUpdaterUpdate:
 
     async def test_update_subclass(self):
         """Subclass can override update() to set values."""
-
-        class TestUpdater(Updater):
-            async def update(self):
-                self.set_INTEGER("1.0", 42)
-                self.set_OCTETSTRING("2.0", "hello")
-
-        u = TestUpdater()
+        u = _SettingUpdater()
         await u.update()
 
-        assert u._values["1.0"] == Value.Integer(42)
+        assert u._values["1.0"] == _INT_42
         assert u._values["2.0"] == Value.OctetString(b"hello")
 
 
@@ -20,7 +20,9 @@ from snmpkit.core import (
     encode_ping_pdu,
     encode_register_pdu,
     encode_response_pdu,
+    encode_response_pdu_prepared,
     encode_unregister_pdu,
+    encode_varbinds,
 )
 
 # Common test data
@@ -221,6 +223,16 @@ class TestEncodePdu:
         header = decode_header(pdu[:HEADER_SIZE])
         assert header.pdu_type == PduTypes.RESPONSE
 
+    def test_encode_response_pdu_prepared(self, sample_varbinds):
+        """Prepared Response PDU matches the regular encoder."""
+        payload = encode_varbinds(sample_varbinds)
+        pdu = encode_response_pdu_prepared(1, 1, 1, 1000, payload)
+        assert pdu == make_response_pdu(sample_varbinds)
+
+    def test_encode_varbinds_empty(self):
+        """Encoding no varbinds yields an empty payload."""
+        assert encode_varbinds([]) == b""
+
     def test_encode_notify_pdu(self):
         """Encode Notify PDU."""
         varbinds = [VarBind(TEST_OID, Value.Integer(1))]
@@ -332,6 +344,14 @@ class TestRoundTrip:
         assert response.varbinds[1].value == Value.TimeTicks(123456)
         assert response.varbinds[2].value == Value.OctetString(b"hostname")
 
+    def test_prepared_response_roundtrip(self, sample_varbinds):
+        """Prepared Response PDU decodes to the original varbinds."""
+        pdu = encode_response_pdu_prepared(1, 1, 1, 1000, encode_varbinds(sample_varbinds))
+        response = decode_response(pdu)
+
+        assert len(response.varbinds) == 3
+        assert response.varbinds[2].value == Value.OctetString(b"hostname")
+
     def test_response_roundtrip_preserves_oid(self):
         """Response PDU preserves OID."""
         oid = Oid("1.3.6.1.2.1.1.1.0")
@@ -1,6 +1,7 @@
 use pyo3::prelude::*;
 use pyo3::types::PyBytes;
-use std::io::Cursor;
+use std::cell::RefCell;
+use std::io::{self, Cursor};
 
 use crate::oid::Oid;
 
@@ -11,15 +12,51 @@ use super::bodies::{
 use super::header::{Flags, HEADER_SIZE, Header, PduType};
 use super::pdu::VarBind;
 
-fn encode_full_pdu(header: Header, body: &[u8]) -> Vec<u8> {
-    let header = header.with_payload_length(body.len() as u32);
-    let mut buf = Vec::with_capacity(HEADER_SIZE + body.len());
-    header.encode(&mut buf).unwrap();
-    buf.extend_from_slice(body);
-    buf
+// Scratch buffers larger than this are released after use instead of
+// being kept around for the next call.
+const SCRATCH_RETAIN: usize = 64 * 1024;
+
+thread_local! {
+    // Per-thread encode buffer, reused across calls. The finished PDU is
+    // copied once into the returned bytes object.
+    static SCRATCH: RefCell<Vec<u8>> = RefCell::new(Vec::with_capacity(1024));
 }
 
-#[pyclass]
+fn with_scratch<T>(f: impl FnOnce(&mut Vec<u8>) -> T) -> T {
+    SCRATCH.with(|cell| match cell.try_borrow_mut() {
+        Ok(mut buf) => {
+            buf.clear();
+            let result = f(&mut *buf);
+            if buf.capacity() > SCRATCH_RETAIN {
+                *buf = Vec::with_capacity(1024);
+            }
+            result
+        }
+        // Re-entered while the buffer is in use (e.g. from a finalizer
+        // triggered by the bytes allocation), fall back to a fresh one.
+        Err(_) => f(&mut Vec::new()),
+    })
+}
+
+// Encode header + body into the scratch buffer. The body is written
+// first and the header is filled in afterwards with the final length.
+fn encode_pdu(
+    py: Python<'_>,
+    header: Header,
+    encode_body: impl FnOnce(&mut Vec<u8>) -> io::Result<()>,
+) -> PyResult<Py<PyBytes>> {
+    with_scratch(|buf| {
+        buf.resize(HEADER_SIZE, 0);
+        encode_body(buf).map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
+
+        let header = header.with_payload_length((buf.len() - HEADER_SIZE) as u32);
+        buf[..HEADER_SIZE].copy_from_slice(&header.to_bytes());
+
+        Ok(PyBytes::new(py, buf).into())
+    })
+}
+
+#[pyclass(frozen)]
 #[derive(Debug, Clone)]
 pub struct AgentXHeader {
     #[pyo3(get)]
@@ -50,7 +87,7 @@ impl AgentXHeader {
     }
 }
 
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Debug, Clone)]
 pub struct AgentXResponse {
     #[pyo3(get)]
@@ -81,7 +118,7 @@ impl AgentXResponse {
     }
 }
 
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Debug, Clone)]
 pub struct AgentXGet {
     #[pyo3(get)]
@@ -95,7 +132,7 @@ impl AgentXGet {
     }
 }
 
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Debug, Clone)]
 pub struct AgentXGetBulk {
     #[pyo3(get)]
@@ -106,7 +143,7 @@ pub struct AgentXGetBulk {
     pub ranges: Vec<(Oid, Oid, bool)>,
 }
 
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Debug, Clone)]
 pub struct AgentXTestSet {
     #[pyo3(get)]
@@ -126,13 +163,8 @@ pub fn encode_open_pdu(
     description: &str,
 ) -> PyResult<Py<PyBytes>> {
     let pdu = OpenPdu::new(timeout, oid.clone(), description.as_bytes().to_vec());
-    let mut body = Vec::new();
-    pdu.encode(&mut body)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
-
     let header = Header::new(PduType::Open, session_id, transaction_id, packet_id);
-    let buf = encode_full_pdu(header, &body);
-    Ok(PyBytes::new(py, &buf).into())
+    encode_pdu(py, header, |body| pdu.encode(body))
 }
 
 #[pyfunction]
@@ -153,13 +185,8 @@ pub fn encode_close_pdu(
         _ => CloseReason::Other,
     };
     let pdu = ClosePdu::new(reason);
-    let mut body = Vec::new();
-    pdu.encode(&mut body)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
-
     let header = Header::new(PduType::Close, session_id, transaction_id, packet_id);
-    let buf = encode_full_pdu(header, &body);
-    Ok(PyBytes::new(py, &buf).into())
+    encode_pdu(py, header, |body| pdu.encode(body))
 }
 
 #[pyfunction]
@@ -176,15 +203,6 @@ pub fn encode_register_pdu(
     context: Option<&str>,
 ) -> PyResult<Py<PyBytes>> {
     let pdu = RegisterPdu::new(subtree.clone(), priority, timeout);
-    let mut body = Vec::new();
-
-    if let Some(ctx) = context {
-        super::pdu::encode_octet_string(&mut body, ctx.as_bytes())
-            .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
-    }
-
-    pdu.encode(&mut body)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
 
     let mut flags = Flags::NETWORK_BYTE_ORDER;
     if context.is_some() {
@@ -193,8 +211,12 @@ pub fn encode_register_pdu(
 
     let header =
         Header::new(PduType::Register, session_id, transaction_id, packet_id).with_flags(flags);
-    let buf = encode_full_pdu(header, &body);
-    Ok(PyBytes::new(py, &buf).into())
+    encode_pdu(py, header, |body| {
+        if let Some(ctx) = context {
+            super::pdu::encode_octet_string(body, ctx.as_bytes())?;
+        }
+        pdu.encode(body)
+    })
 }
 
 #[pyfunction]
@@ -209,15 +231,6 @@ pub fn encode_unregister_pdu(
     context: Option<&str>,
 ) -> PyResult<Py<PyBytes>> {
     let pdu = UnregisterPdu::new(subtree.clone(), priority);
-    let mut body = Vec::new();
-
-    if let Some(ctx) = context {
-        super::pdu::encode_octet_string(&mut body, ctx.as_bytes())
-            .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
-    }
-
-    pdu.encode(&mut body)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
 
     let mut flags = Flags::NETWORK_BYTE_ORDER;
     if context.is_some() {
@@ -226,8 +239,12 @@ pub fn encode_unregister_pdu(
 
     let header =
         Header::new(PduType::Unregister, session_id, transaction_id, packet_id).with_flags(flags);
-    let buf = encode_full_pdu(header, &body);
-    Ok(PyBytes::new(py, &buf).into())
+    encode_pdu(py, header, |body| {
+        if let Some(ctx) = context {
+            super::pdu::encode_octet_string(body, ctx.as_bytes())?;
+        }
+        pdu.encode(body)
+    })
 }
 
 #[pyfunction]
@@ -248,13 +265,39 @@ pub fn encode_response_pdu(
         ResponsePdu::new(sys_uptime, varbinds)
     };
 
-    let mut body = Vec::new();
-    pdu.encode(&mut body)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
+    let header = Header::new(PduType::Response, session_id, transaction_id, packet_id);
+    encode_pdu(py, header, |body| pdu.encode(body))
+}
 
+#[pyfunction]
+pub fn encode_varbinds(py: Python<'_>, varbinds: Vec<VarBind>) -> PyResult<Py<PyBytes>> {
+    with_scratch(|buf| {
+        for vb in &varbinds {
+            vb.encode(buf)
+                .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
+        }
+        Ok(PyBytes::new(py, buf).into())
+    })
+}
+
+#[pyfunction]
+pub fn encode_response_pdu_prepared(
+    py: Python<'_>,
+    session_id: u32,
+    transaction_id: u32,
+    packet_id: u32,
+    sys_uptime: u32,
+    payload: &[u8],
+) -> PyResult<Py<PyBytes>> {
+    // Varbinds were already encoded by encode_varbinds(), only the
+    // response header (uptime, error=0, index=0) is written here.
+    let pdu = ResponsePdu::new(sys_uptime, Vec::new());
     let header = Header::new(PduType::Response, session_id, transaction_id, packet_id);
-    let buf = encode_full_pdu(header, &body);
-    Ok(PyBytes::new(py, &buf).into())
+    encode_pdu(py, header, |body| {
+        pdu.encode(body)?;
+        body.extend_from_slice(payload);
+        Ok(())
+    })
 }
 
 #[pyfunction]
@@ -268,15 +311,6 @@ pub fn encode_notify_pdu(
     context: Option<&str>,
 ) -> PyResult<Py<PyBytes>> {
     let pdu = NotifyPdu::new(varbinds);
-    let mut body = Vec::new();
-
-    if let Some(ctx) = context {
-        super::pdu::encode_octet_string(&mut body, ctx.as_bytes())
-            .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
-    }
-
-    pdu.encode(&mut body)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
 
     let mut flags = Flags::NETWORK_BYTE_ORDER;
     if context.is_some() {
@@ -285,8 +319,12 @@ pub fn encode_notify_pdu(
 
     let header =
         Header::new(PduType::Notify, session_id, transaction_id, packet_id).with_flags(flags);
-    let buf = encode_full_pdu(header, &body);
-    Ok(PyBytes::new(py, &buf).into())
+    encode_pdu(py, header, |body| {
+        if let Some(ctx) = context {
+            super::pdu::encode_octet_string(body, ctx.as_bytes())?;
+        }
+        pdu.encode(body)
+    })
 }
 
 #[pyfunction]
@@ -297,13 +335,8 @@ pub fn encode_ping_pdu(
     packet_id: u32,
 ) -> PyResult<Py<PyBytes>> {
     let pdu = PingPdu::new();
-    let mut body = Vec::new();
-    pdu.encode(&mut body)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
-
     let header = Header::new(PduType::Ping, session_id, transaction_id, packet_id);
-    let buf = encode_full_pdu(header, &body);
-    Ok(PyBytes::new(py, &buf).into())
+    encode_pdu(py, header, |body| pdu.encode(body))
 }
 
 // Decoding functions
@@ -316,9 +349,9 @@ pub fn decode_header(data: &[u8]) -> PyResult<AgentXHeader> {
         ));
     }
 
-    let mut cursor = Cursor::new(data);
-    let header = Header::decode(&mut cursor)
-        .map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
+    let buf: &[u8; HEADER_SIZE] = data[..HEADER_SIZE].try_into().unwrap();
+    let header =
+        Header::from_bytes(buf).map_err(|e| pyo3::exceptions::PyIOError::new_err(e.to_string()))?;
 
     Ok(AgentXHeader {
         pdu_type: header.pdu_type as u8,
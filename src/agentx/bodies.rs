@@ -529,9 +529,11 @@ impl ResponsePdu {
     }
 
     pub fn encode<W: Write>(&self, writer: &mut W) -> io::Result<()> {
-        writer.write_all(&self.sys_uptime.to_be_bytes())?;
-        writer.write_all(&self.error.to_be_bytes())?;
-        writer.write_all(&self.index.to_be_bytes())?;
+        let mut fixed = [0u8; 8];
+        fixed[..4].copy_from_slice(&self.sys_uptime.to_be_bytes());
+        fixed[4..6].copy_from_slice(&self.error.to_be_bytes());
+        fixed[6..].copy_from_slice(&self.index.to_be_bytes());
+        writer.write_all(&fixed)?;
 
         for vb in &self.varbinds {
             vb.encode(writer)?;
@@ -100,52 +100,51 @@ impl Header {
     }
 
     pub fn encode<W: Write>(&self, writer: &mut W) -> io::Result<()> {
-        writer.write_all(&[self.version])?;
-        writer.write_all(&[self.pdu_type as u8])?;
-        writer.write_all(&[self.flags.bits()])?;
-        writer.write_all(&[0u8])?; // reserved
-
-        if self.flags.contains(Flags::NETWORK_BYTE_ORDER) {
-            writer.write_all(&self.session_id.to_be_bytes())?;
-            writer.write_all(&self.transaction_id.to_be_bytes())?;
-            writer.write_all(&self.packet_id.to_be_bytes())?;
-            writer.write_all(&self.payload_length.to_be_bytes())?;
+        writer.write_all(&self.to_bytes())
+    }
+
+    pub fn to_bytes(&self) -> [u8; HEADER_SIZE] {
+        let write_u32: fn(u32) -> [u8; 4] = if self.flags.contains(Flags::NETWORK_BYTE_ORDER) {
+            u32::to_be_bytes
         } else {
-            writer.write_all(&self.session_id.to_le_bytes())?;
-            writer.write_all(&self.transaction_id.to_le_bytes())?;
-            writer.write_all(&self.packet_id.to_le_bytes())?;
-            writer.write_all(&self.payload_length.to_le_bytes())?;
-        }
+            u32::to_le_bytes
+        };
 
-        Ok(())
+        let mut buf = [0u8; HEADER_SIZE];
+        buf[0] = self.version;
+        buf[1] = self.pdu_type as u8;
+        buf[2] = self.flags.bits();
+        // buf[3] reserved
+        buf[4..8].copy_from_slice(&write_u32(self.session_id));
+        buf[8..12].copy_from_slice(&write_u32(self.transaction_id));
+        buf[12..16].copy_from_slice(&write_u32(self.packet_id));
+        buf[16..20].copy_from_slice(&write_u32(self.payload_length));
+        buf
     }
 
     pub fn decode<R: Read>(reader: &mut R) -> io::Result<Self> {
         let mut buf = [0u8; HEADER_SIZE];
         reader.read_exact(&mut buf)?;
+        Self::from_bytes(&buf)
+    }
 
+    pub fn from_bytes(buf: &[u8; HEADER_SIZE]) -> io::Result<Self> {
         let version = buf[0];
         let pdu_type = PduType::try_from(buf[1]).map_err(|v| {
             io::Error::new(io::ErrorKind::InvalidData, format!("unknown PDU type: {v}"))
         })?;
         let flags = Flags::from_bits_truncate(buf[2]);
 
-        let network_order = flags.contains(Flags::NETWORK_BYTE_ORDER);
-        let (session_id, transaction_id, packet_id, payload_length) = if network_order {
-            (
-                u32::from_be_bytes([buf[4], buf[5], buf[6], buf[7]]),
-                u32::from_be_bytes([buf[8], buf[9], buf[10], buf[11]]),
-                u32::from_be_bytes([buf[12], buf[13], buf[14], buf[15]]),
-                u32::from_be_bytes([buf[16], buf[17], buf[18], buf[19]]),
-            )
+        // Byte order is picked once from the flags, not per field
+        let read_u32: fn([u8; 4]) -> u32 = if flags.contains(Flags::NETWORK_BYTE_ORDER) {
+            u32::from_be_bytes
         } else {
-            (
-                u32::from_le_bytes([buf[4], buf[5], buf[6], buf[7]]),
-                u32::from_le_bytes([buf[8], buf[9], buf[10], buf[11]]),
-                u32::from_le_bytes([buf[12], buf[13], buf[14], buf[15]]),
-                u32::from_le_bytes([buf[16], buf[17], buf[18], buf[19]]),
-            )
+            u32::from_le_bytes
         };
+        let session_id = read_u32([buf[4], buf[5], buf[6], buf[7]]);
+        let transaction_id = read_u32([buf[8], buf[9], buf[10], buf[11]]);
+        let packet_id = read_u32([buf[12], buf[13], buf[14], buf[15]]);
+        let payload_length = read_u32([buf[16], buf[17], buf[18], buf[19]]);
 
         Ok(Self {
             version,
@@ -190,6 +189,20 @@ mod tests {
         assert_eq!(header.payload_length, 50);
     }
 
+    #[test]
+    fn test_header_from_bytes_little_endian() {
+        let header = Header::new(PduType::Get, 1, 0x0102_0304, 3)
+            .with_payload_length(64)
+            .with_flags(Flags::empty());
+
+        let mut buf = Vec::new();
+        header.encode(&mut buf).unwrap();
+        assert_eq!(&buf[8..12], &[0x04, 0x03, 0x02, 0x01]);
+
+        let decoded = Header::from_bytes(buf.as_slice().try_into().unwrap()).unwrap();
+        assert_eq!(decoded, header);
+    }
+
     #[test]
     fn test_pdu_type_conversion() {
         assert_eq!(PduType::try_from(1), Ok(PduType::Open));
@@ -197,4 +210,18 @@ mod tests {
         assert!(PduType::try_from(0).is_err());
         assert!(PduType::try_from(19).is_err());
     }
+
+    #[test]
+    fn test_header_to_bytes_layout() {
+        let header = Header::new(PduType::Response, 0x01020304, 5, 6).with_payload_length(8);
+        let buf = header.to_bytes();
+
+        assert_eq!(
+            buf[..4],
+            [1, PduType::Response as u8, header.flags.bits(), 0]
+        );
+        assert_eq!(buf[4..8], [1, 2, 3, 4]);
+        assert_eq!(buf[16..20], [0, 0, 0, 8]);
+        assert_eq!(Header::from_bytes(&buf).unwrap(), header);
+    }
 }
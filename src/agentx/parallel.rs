@@ -3,7 +3,9 @@ use std::io;
 use crate::oid::Oid;
 use crate::types::Value;
 
-use super::pdu::{SearchRange, VarBind, encode_oid, encode_value};
+use super::pdu::{
+    SearchRange, VarBind, encode_oid, encode_value, encoded_oid_len, encoded_value_len,
+};
 
 #[cfg(feature = "parallel")]
 use rayon::prelude::*;
@@ -13,7 +15,7 @@ pub fn encode_varbinds_batch(varbinds: &[VarBind]) -> io::Result<Vec<Vec<u8>>> {
     varbinds
         .par_iter()
         .map(|vb| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(vb.encoded_len());
             vb.encode(&mut buf)?;
             Ok(buf)
         })
@@ -25,7 +27,7 @@ pub fn encode_varbinds_batch(varbinds: &[VarBind]) -> io::Result<Vec<Vec<u8>>> {
     varbinds
         .iter()
         .map(|vb| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(vb.encoded_len());
             vb.encode(&mut buf)?;
             Ok(buf)
         })
@@ -37,7 +39,7 @@ pub fn encode_search_ranges_batch(ranges: &[SearchRange]) -> io::Result<Vec<Vec<
     ranges
         .par_iter()
         .map(|r| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(r.encoded_len());
             r.encode(&mut buf)?;
             Ok(buf)
         })
@@ -49,7 +51,7 @@ pub fn encode_search_ranges_batch(ranges: &[SearchRange]) -> io::Result<Vec<Vec<
     ranges
         .iter()
         .map(|r| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(r.encoded_len());
             r.encode(&mut buf)?;
             Ok(buf)
         })
@@ -60,7 +62,7 @@ pub fn encode_search_ranges_batch(ranges: &[SearchRange]) -> io::Result<Vec<Vec<
 pub fn encode_oids_batch(oids: &[Oid], include: bool) -> io::Result<Vec<Vec<u8>>> {
     oids.par_iter()
         .map(|oid| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(encoded_oid_len(oid));
             encode_oid(&mut buf, oid, include)?;
             Ok(buf)
         })
@@ -71,7 +73,7 @@ pub fn encode_oids_batch(oids: &[Oid], include: bool) -> io::Result<Vec<Vec<u8>>
 pub fn encode_oids_batch(oids: &[Oid], include: bool) -> io::Result<Vec<Vec<u8>>> {
     oids.iter()
         .map(|oid| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(encoded_oid_len(oid));
             encode_oid(&mut buf, oid, include)?;
             Ok(buf)
         })
@@ -83,7 +85,7 @@ pub fn encode_values_batch(values: &[Value]) -> io::Result<Vec<Vec<u8>>> {
     values
         .par_iter()
         .map(|v| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(encoded_value_len(v));
             encode_value(&mut buf, v)?;
             Ok(buf)
         })
@@ -95,7 +97,7 @@ pub fn encode_values_batch(values: &[Value]) -> io::Result<Vec<Vec<u8>>> {
     values
         .iter()
         .map(|v| {
-            let mut buf = Vec::new();
+            let mut buf = Vec::with_capacity(encoded_value_len(v));
             encode_value(&mut buf, v)?;
             Ok(buf)
         })
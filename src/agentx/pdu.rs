@@ -4,34 +4,63 @@ use std::io::{self, Read, Write};
 use crate::oid::Oid;
 use crate::types::Value;
 
+// Sub-identifiers are staged in a stack buffer of this many entries so
+// that a typical OID goes out in a single write.
+const SUBID_CHUNK: usize = 32;
+
 fn pad_to_4(len: usize) -> usize {
     (4 - (len % 4)) % 4
 }
 
-pub fn encode_oid<W: Write>(writer: &mut W, oid: &Oid, include: bool) -> io::Result<()> {
-    let parts = oid.parts();
-
-    // Check for internet prefix optimization (1.3.6.1)
-    let (prefix, start_idx) = if parts.len() >= 5
-        && parts[0] == 1
-        && parts[1] == 3
-        && parts[2] == 6
-        && parts[3] == 1
-        && parts[4] <= 255
-    {
-        (parts[4] as u8, 5)
-    } else {
-        (0u8, 0)
-    };
+// Internet prefix compression (RFC 2741 section 5.1): 1.3.6.1.X with X in
+// 1..=255 is sent as prefix X plus the remaining sub-identifiers. A prefix of
+// 0 means "no prefix", so 1.3.6.1.0 must be sent uncompressed.
+fn split_internet_prefix(parts: &[u32]) -> (u8, &[u32]) {
+    match parts {
+        [1, 3, 6, 1, p @ 1..=255, rest @ ..] => (*p as u8, rest),
+        _ => (0u8, parts),
+    }
+}
+
+/// Number of bytes `encode_oid` writes for `oid`.
+pub fn encoded_oid_len(oid: &Oid) -> usize {
+    let (_, subids) = split_internet_prefix(oid.parts());
+    4 + subids.len() * 4
+}
+
+/// Number of bytes `encode_octet_string` writes for `data`.
+pub fn encoded_octet_string_len(data: &[u8]) -> usize {
+    4 + data.len() + pad_to_4(data.len())
+}
 
-    let actual_n_subid = (parts.len() - start_idx) as u8;
-    writer.write_all(&[actual_n_subid])?;
-    writer.write_all(&[prefix])?;
-    writer.write_all(&[include as u8])?;
-    writer.write_all(&[0u8])?; // reserved
+/// Number of bytes `encode_value` writes for `value`.
+pub fn encoded_value_len(value: &Value) -> usize {
+    4 + match value {
+        Value::Integer(_)
+        | Value::IpAddress(_, _, _, _)
+        | Value::Counter32(_)
+        | Value::Gauge32(_)
+        | Value::TimeTicks(_) => 4,
+        Value::Counter64(_) => 8,
+        Value::OctetString(v) | Value::Opaque(v) => encoded_octet_string_len(v),
+        Value::ObjectIdentifier(oid) => encoded_oid_len(oid),
+        Value::Null() | Value::NoSuchObject() | Value::NoSuchInstance() | Value::EndOfMibView() => {
+            0
+        }
+    }
+}
 
-    for &part in &parts[start_idx..] {
-        writer.write_all(&part.to_be_bytes())?;
+pub fn encode_oid<W: Write>(writer: &mut W, oid: &Oid, include: bool) -> io::Result<()> {
+    let (prefix, subids) = split_internet_prefix(oid.parts());
+    let actual_n_subid = subids.len() as u8;
+    writer.write_all(&[actual_n_subid, prefix, include as u8, 0u8])?; // last byte reserved
+
+    let mut buf = [0u8; SUBID_CHUNK * 4];
+    for chunk in subids.chunks(SUBID_CHUNK) {
+        for (dst, &part) in buf.chunks_exact_mut(4).zip(chunk) {
+            dst.copy_from_slice(&part.to_be_bytes());
+        }
+        writer.write_all(&buf[..chunk.len() * 4])?;
     }
 
     Ok(())
@@ -45,7 +74,8 @@ pub fn decode_oid<R: Read>(reader: &mut R) -> io::Result<(Oid, bool)> {
     let prefix = header[1];
     let include = header[2] != 0;
 
-    let mut parts = Vec::with_capacity(n_subid + 5);
+    let prefix_len = if prefix != 0 { 5 } else { 0 };
+    let mut parts = Vec::with_capacity(n_subid + prefix_len);
 
     if prefix != 0 {
         parts.extend_from_slice(&[1, 3, 6, 1, prefix as u32]);
@@ -62,8 +92,7 @@ pub fn decode_oid<R: Read>(reader: &mut R) -> io::Result<(Oid, bool)> {
         Oid::from_slice(&[0])
             .map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e.to_string()))?
     } else {
-        Oid::from_slice(&parts)
-            .map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e.to_string()))?
+        Oid::new(parts).map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e.to_string()))?
     };
 
     Ok((oid, include))
@@ -76,9 +105,7 @@ pub fn encode_octet_string<W: Write>(writer: &mut W, data: &[u8]) -> io::Result<
 
     // Pad to 4-byte boundary
     let padding = pad_to_4(data.len());
-    for _ in 0..padding {
-        writer.write_all(&[0u8])?;
-    }
+    writer.write_all(&[0u8; 3][..padding])?;
 
     Ok(())
 }
@@ -117,6 +144,10 @@ impl SearchRange {
         }
     }
 
+    pub fn encoded_len(&self) -> usize {
+        encoded_oid_len(&self.start) + encoded_oid_len(&self.end)
+    }
+
     pub fn encode<W: Write>(&self, writer: &mut W) -> io::Result<()> {
         encode_oid(writer, &self.start, self.include)?;
         encode_oid(writer, &self.end, false)?;
@@ -153,43 +184,58 @@ pub enum ValueType {
     EndOfMibView = 130,
 }
 
+fn value_type(value: &Value) -> ValueType {
+    match value {
+        Value::Integer(_) => ValueType::Integer,
+        Value::OctetString(_) => ValueType::OctetString,
+        Value::Null() => ValueType::Null,
+        Value::ObjectIdentifier(_) => ValueType::ObjectIdentifier,
+        Value::IpAddress(_, _, _, _) => ValueType::IpAddress,
+        Value::Counter32(_) => ValueType::Counter32,
+        Value::Gauge32(_) => ValueType::Gauge32,
+        Value::TimeTicks(_) => ValueType::TimeTicks,
+        Value::Opaque(_) => ValueType::Opaque,
+        Value::Counter64(_) => ValueType::Counter64,
+        Value::NoSuchObject() => ValueType::NoSuchObject,
+        Value::NoSuchInstance() => ValueType::NoSuchInstance,
+        Value::EndOfMibView() => ValueType::EndOfMibView,
+    }
+}
+
 pub fn encode_value<W: Write>(writer: &mut W, value: &Value) -> io::Result<()> {
-    let (type_code, data): (u16, Option<Vec<u8>>) = match value {
-        Value::Integer(v) => (ValueType::Integer as u16, Some(v.to_be_bytes().to_vec())),
-        Value::OctetString(v) => {
-            let mut buf = Vec::new();
-            encode_octet_string(&mut buf, v)?;
-            (ValueType::OctetString as u16, Some(buf))
+    let type_code = value_type(value) as u16;
+    let [t0, t1] = type_code.to_be_bytes();
+
+    // Fixed-size values go out together with the type header in one write;
+    // variable-length ones are written straight after it.
+    match value {
+        Value::Integer(v) => {
+            let [a, b, c, d] = v.to_be_bytes();
+            writer.write_all(&[t0, t1, 0, 0, a, b, c, d])
+        }
+        Value::Counter32(v) | Value::Gauge32(v) | Value::TimeTicks(v) => {
+            let [a, b, c, d] = v.to_be_bytes();
+            writer.write_all(&[t0, t1, 0, 0, a, b, c, d])
+        }
+        Value::IpAddress(a, b, c, d) => writer.write_all(&[t0, t1, 0, 0, *a, *b, *c, *d]),
+        Value::Counter64(v) => {
+            let mut buf = [0u8; 12];
+            buf[..2].copy_from_slice(&[t0, t1]);
+            buf[4..].copy_from_slice(&v.to_be_bytes());
+            writer.write_all(&buf)
+        }
+        Value::OctetString(v) | Value::Opaque(v) => {
+            writer.write_all(&[t0, t1, 0, 0])?;
+            encode_octet_string(writer, v)
         }
-        Value::Null() => (ValueType::Null as u16, None),
         Value::ObjectIdentifier(oid) => {
-            let mut buf = Vec::new();
-            encode_oid(&mut buf, oid, false)?;
-            (ValueType::ObjectIdentifier as u16, Some(buf))
+            writer.write_all(&[t0, t1, 0, 0])?;
+            encode_oid(writer, oid, false)
         }
-        Value::IpAddress(a, b, c, d) => (ValueType::IpAddress as u16, Some(vec![*a, *b, *c, *d])),
-        Value::Counter32(v) => (ValueType::Counter32 as u16, Some(v.to_be_bytes().to_vec())),
-        Value::Gauge32(v) => (ValueType::Gauge32 as u16, Some(v.to_be_bytes().to_vec())),
-        Value::TimeTicks(v) => (ValueType::TimeTicks as u16, Some(v.to_be_bytes().to_vec())),
-        Value::Opaque(v) => {
-            let mut buf = Vec::new();
-            encode_octet_string(&mut buf, v)?;
-            (ValueType::Opaque as u16, Some(buf))
+        Value::Null() | Value::NoSuchObject() | Value::NoSuchInstance() | Value::EndOfMibView() => {
+            writer.write_all(&[t0, t1, 0, 0]) // last two bytes reserved
         }
-        Value::Counter64(v) => (ValueType::Counter64 as u16, Some(v.to_be_bytes().to_vec())),
-        Value::NoSuchObject() => (ValueType::NoSuchObject as u16, None),
-        Value::NoSuchInstance() => (ValueType::NoSuchInstance as u16, None),
-        Value::EndOfMibView() => (ValueType::EndOfMibView as u16, None),
-    };
-
-    writer.write_all(&type_code.to_be_bytes())?;
-    writer.write_all(&[0u8; 2])?; // reserved
-
-    if let Some(d) = data {
-        writer.write_all(&d)?;
     }
-
-    Ok(())
 }
 
 pub fn decode_value<R: Read>(reader: &mut R) -> io::Result<Value> {
@@ -257,7 +303,7 @@ pub fn decode_value<R: Read>(reader: &mut R) -> io::Result<Value> {
 }
 
 #[derive(Debug, Clone, PartialEq)]
-#[pyclass]
+#[pyclass(frozen)]
 pub struct VarBind {
     #[pyo3(get)]
     pub oid: Oid,
@@ -282,6 +328,10 @@ impl VarBind {
         Self { oid, value }
     }
 
+    pub fn encoded_len(&self) -> usize {
+        encoded_oid_len(&self.oid) + encoded_value_len(&self.value)
+    }
+
     pub fn encode<W: Write>(&self, writer: &mut W) -> io::Result<()> {
         encode_oid(writer, &self.oid, false)?;
         encode_value(writer, &self.value)?;
@@ -324,6 +374,20 @@ mod tests {
         assert_eq!(buf[1], 4); // prefix (the 4 from 1.3.6.1.4)
     }
 
+    #[test]
+    fn test_oid_long_roundtrip() {
+        // Longer than one staging chunk, no internet prefix
+        let parts: Vec<u32> = (0..70).map(|i| i * 1000 + 7).collect();
+        let oid = Oid::from_slice(&parts).unwrap();
+
+        let mut buf = Vec::new();
+        encode_oid(&mut buf, &oid, false).unwrap();
+        assert_eq!(buf.len(), 4 + 70 * 4);
+
+        let (decoded, _) = decode_oid(&mut buf.as_slice()).unwrap();
+        assert_eq!(decoded, oid);
+    }
+
     #[test]
     fn test_octet_string_roundtrip() {
         let data = b"hello world";
@@ -407,4 +471,79 @@ mod tests {
         assert_eq!(decoded.oid.to_string(), varbind.oid.to_string());
         assert_eq!(decoded.value, varbind.value);
     }
+
+    #[test]
+    fn test_encoded_len_matches_encode() {
+        let oid: Oid = "1.3.6.1.2.1.1.1.0".parse().unwrap();
+        let values = [
+            Value::Integer(-1),
+            Value::OctetString(b"hello".to_vec()),
+            Value::OctetString(vec![]),
+            Value::Null(),
+            Value::ObjectIdentifier("1.3.6.1.4.1.99".parse().unwrap()),
+            Value::ObjectIdentifier("2.5.4".parse().unwrap()),
+            Value::IpAddress(10, 0, 0, 1),
+            Value::Counter32(1),
+            Value::Gauge32(2),
+            Value::TimeTicks(3),
+            Value::Opaque(vec![1, 2, 3, 4]),
+            Value::Counter64(4),
+            Value::NoSuchObject(),
+            Value::NoSuchInstance(),
+            Value::EndOfMibView(),
+        ];
+
+        for value in values {
+            let varbind = VarBind::new(oid.clone(), value);
+            let mut buf = Vec::new();
+            varbind.encode(&mut buf).unwrap();
+            assert_eq!(varbind.encoded_len(), buf.len(), "{:?}", varbind.value);
+        }
+
+        let range = SearchRange::new(oid.clone(), "1.2".parse().unwrap(), true);
+        let mut buf = Vec::new();
+        range.encode(&mut buf).unwrap();
+        assert_eq!(range.encoded_len(), buf.len());
+    }
+
+    #[test]
+    fn test_value_wire_layout() {
+        let mut buf = Vec::new();
+        encode_value(&mut buf, &Value::Counter64(0x0102_0304_0506_0708)).unwrap();
+        assert_eq!(buf, [0, 70, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8]);
+
+        let mut buf = Vec::new();
+        encode_value(&mut buf, &Value::OctetString(b"abcde".to_vec())).unwrap();
+        assert_eq!(
+            buf,
+            [
+                0, 4, 0, 0, 0, 0, 0, 5, b'a', b'b', b'c', b'd', b'e', 0, 0, 0
+            ]
+        );
+    }
+
+    #[test]
+    fn test_oid_prefix_zero_not_compressed() {
+        let oid: Oid = "1.3.6.1.0.5".parse().unwrap();
+
+        let mut buf = Vec::new();
+        encode_oid(&mut buf, &oid, false).unwrap();
+        assert_eq!(buf[0], 6); // n_subid
+        assert_eq!(buf[1], 0); // no prefix
+
+        let (decoded, _) = decode_oid(&mut buf.as_slice()).unwrap();
+        assert_eq!(decoded, oid);
+    }
+
+    #[test]
+    fn test_oid_prefix_only() {
+        let oid: Oid = "1.3.6.1.4".parse().unwrap();
+
+        let mut buf = Vec::new();
+        encode_oid(&mut buf, &oid, false).unwrap();
+        assert_eq!(buf, [0, 4, 0, 0]);
+
+        let (decoded, _) = decode_oid(&mut buf.as_slice()).unwrap();
+        assert_eq!(decoded, oid);
+    }
 }
@@ -41,6 +41,14 @@ fn snmpkit_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
         agentx::bindings::encode_response_pdu,
         m
     )?)?;
+    m.add_function(pyo3::wrap_pyfunction!(
+        agentx::bindings::encode_response_pdu_prepared,
+        m
+    )?)?;
+    m.add_function(pyo3::wrap_pyfunction!(
+        agentx::bindings::encode_varbinds,
+        m
+    )?)?;
     m.add_function(pyo3::wrap_pyfunction!(
         agentx::bindings::encode_notify_pdu,
         m
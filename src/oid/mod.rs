@@ -8,9 +8,11 @@ use std::fmt;
 use std::str::FromStr;
 
 #[derive(Clone, Debug, PartialEq, Eq, Hash)]
-#[pyclass]
+#[pyclass(frozen)]
 pub struct Oid {
-    parts: Vec<u32>,
+    // Boxed slice rather than Vec: OIDs never grow in place, so there is no
+    // spare capacity or capacity word to carry around per instance.
+    parts: Box<[u32]>,
 }
 
 #[pymethods]
@@ -53,7 +55,7 @@ impl Oid {
 
     #[getter]
     fn get_parts(&self) -> Vec<u32> {
-        self.parts.clone()
+        self.parts.to_vec()
     }
 
     #[pyo3(name = "starts_with")]
@@ -68,19 +70,12 @@ impl Oid {
 
     #[pyo3(name = "parent")]
     fn py_parent(&self) -> Option<Oid> {
-        if self.parts.len() <= 1 {
-            return None;
-        }
-        Some(Oid {
-            parts: self.parts[..self.parts.len() - 1].to_vec(),
-        })
+        self.parent()
     }
 
     #[pyo3(name = "child")]
     fn py_child(&self, sub_id: u32) -> Oid {
-        let mut parts = self.parts.clone();
-        parts.push(sub_id);
-        Oid { parts }
+        self.child(sub_id)
     }
 }
 
@@ -108,7 +103,9 @@ impl Oid {
         if parts.is_empty() {
             return Err(OidError::Empty);
         }
-        Ok(Self { parts })
+        Ok(Self {
+            parts: parts.into_boxed_slice(),
+        })
     }
 
     pub fn from_slice(parts: &[u32]) -> Result<Self, OidError> {
@@ -140,14 +137,17 @@ impl Oid {
             return None;
         }
         Some(Oid {
-            parts: self.parts[..self.parts.len() - 1].to_vec(),
+            parts: self.parts[..self.parts.len() - 1].into(),
         })
     }
 
     pub fn child(&self, sub_id: u32) -> Oid {
-        let mut parts = self.parts.clone();
+        let mut parts = Vec::with_capacity(self.parts.len() + 1);
+        parts.extend_from_slice(&self.parts);
         parts.push(sub_id);
-        Oid { parts }
+        Oid {
+            parts: parts.into_boxed_slice(),
+        }
     }
 
     pub fn common_prefix_len(&self, other: &Oid) -> usize {
@@ -170,22 +170,70 @@ impl FromStr for Oid {
             return Err(OidError::Empty);
         }
 
-        let parts: Result<Vec<u32>, _> = s
-            .split('.')
-            .map(|part| {
-                part.parse::<u32>()
-                    .map_err(|_| OidError::InvalidPart(part.to_string()))
-            })
-            .collect();
+        // Single pass over the bytes: accumulate digits, flush on '.'.
+        let bytes = s.as_bytes();
+        // Exact capacity so the conversion to a boxed slice never reallocates
+        let n_parts = bytes.iter().filter(|&&b| b == b'.').count() + 1;
+        let mut parts = Vec::with_capacity(n_parts);
+        let mut start = 0;
+        let mut acc: u32 = 0;
+        let mut has_digit = false;
+
+        for (i, &b) in bytes.iter().enumerate() {
+            if b == b'.' {
+                if !has_digit {
+                    return Err(invalid_part(s, start));
+                }
+                parts.push(acc);
+                acc = 0;
+                start = i + 1;
+                has_digit = false;
+                continue;
+            }
+
+            // Accept a leading '+' on an arc, as str::parse::<u32> does
+            if b == b'+' && i == start {
+                continue;
+            }
+
+            let digit = b.wrapping_sub(b'0');
+            if digit > 9 {
+                return Err(invalid_part(s, start));
+            }
+            acc = match acc
+                .checked_mul(10)
+                .and_then(|v| v.checked_add(digit as u32))
+            {
+                Some(v) => v,
+                None => return Err(invalid_part(s, start)),
+            };
+            has_digit = true;
+        }
 
-        Self::new(parts?)
+        if !has_digit {
+            return Err(invalid_part(s, start));
+        }
+        parts.push(acc);
+
+        Self::new(parts)
     }
 }
 
+fn invalid_part(s: &str, start: usize) -> OidError {
+    let rest = &s[start..];
+    let end = rest.find('.').unwrap_or(rest.len());
+    OidError::InvalidPart(rest[..end].to_string())
+}
+
 impl fmt::Display for Oid {
     fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
-        let s: Vec<String> = self.parts.iter().map(|p| p.to_string()).collect();
-        write!(f, "{}", s.join("."))
+        for (i, part) in self.parts.iter().enumerate() {
+            if i > 0 {
+                f.write_str(".")?;
+            }
+            write!(f, "{part}")?;
+        }
+        Ok(())
     }
 }
 
@@ -229,6 +277,45 @@ mod tests {
         assert!(matches!(result, Err(OidError::InvalidPart(_))));
     }
 
+    #[test]
+    fn test_parse_invalid_part_text() {
+        let result: Result<Oid, _> = "1.3.6x.1".parse();
+        assert_eq!(result, Err(OidError::InvalidPart("6x".to_string())));
+    }
+
+    #[test]
+    fn test_parse_empty_part() {
+        let result: Result<Oid, _> = "1..3".parse();
+        assert_eq!(result, Err(OidError::InvalidPart(String::new())));
+
+        let result: Result<Oid, _> = "1.3.".parse();
+        assert_eq!(result, Err(OidError::InvalidPart(String::new())));
+    }
+
+    #[test]
+    fn test_parse_plus_sign() {
+        let oid: Oid = "+1.3.+6".parse().unwrap();
+        assert_eq!(oid.parts(), &[1, 3, 6]);
+
+        let result: Result<Oid, _> = "1.+.3".parse();
+        assert_eq!(result, Err(OidError::InvalidPart("+".to_string())));
+
+        let result: Result<Oid, _> = "1.++3".parse();
+        assert_eq!(result, Err(OidError::InvalidPart("++3".to_string())));
+
+        let result: Result<Oid, _> = "1.3.+".parse();
+        assert_eq!(result, Err(OidError::InvalidPart("+".to_string())));
+    }
+
+    #[test]
+    fn test_parse_overflow() {
+        let oid: Oid = "1.4294967295".parse().unwrap();
+        assert_eq!(oid.parts(), &[1, u32::MAX]);
+
+        let result: Result<Oid, _> = "1.4294967296".parse();
+        assert_eq!(result, Err(OidError::InvalidPart("4294967296".to_string())));
+    }
+
     #[test]
     fn test_display() {
         let oid: Oid = "1.3.6.1.4.1".parse().unwrap();
@@ -276,4 +363,11 @@ mod tests {
         assert!(!parent.is_parent_of(&sibling));
         assert!(!parent.is_parent_of(&parent));
     }
+
+    #[test]
+    fn test_display_roundtrip() {
+        let oid: Oid = "1.3.6.1.4.1.4294967295.0".parse().unwrap();
+        assert_eq!(oid.to_string(), "1.3.6.1.4.1.4294967295.0");
+        assert_eq!(Oid::from_slice(&[7]).unwrap().to_string(), "7");
+    }
 }